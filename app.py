@@ -18,6 +18,8 @@ from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 from watchdog.observers.api import BaseObserver
 
+from scraper_utils.job_store import JobStore
+
 DEMO_STATE = False
 DEBUG_MODE = True
 WORKING_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -182,6 +184,21 @@ def get_job_scrape_filename(date_str: str) -> str:
             json_filename = scrape
     return json_filename
 
+def load_jobs_from_store(selected_date: str) -> list:
+    with open('config.yaml', 'r') as f:
+        app_config = yaml.safe_load(f)
+    jobs_database_path = os.path.abspath(os.path.join(WORKING_DIR, app_config['jobs_database_filepath']))
+    timespan_days = {
+        "past day": 1,
+        "past week": 7,
+        "past month": 30,
+    }
+    with JobStore(jobs_database_path) as job_store:
+        if selected_date.lower() == "all jobs":
+            return job_store.get_all_jobs()
+        since_date = datetime.today().date() - timedelta(days=timespan_days[selected_date.lower()])
+        return job_store.get_jobs_posted_since(since_date)
+
 def load_customizations() -> dict:
     customization_data = {}
     with open('customizations.yaml', 'r') as f:
@@ -210,6 +227,8 @@ def get_job_data():
     if not request.method == 'POST':
         return jsonify({'error': 'Invalid request method'})
     selected_date = request.form['date']
+    if selected_date.lower() in ("past day", "past week", "past month", "all jobs"):
+        return jsonify(load_jobs_from_store(selected_date))
     job_scrape_dir = 'scrapes'
     file_date_str = selected_date.replace('-', '_').replace(' ', '_').lower()
     json_filename = get_job_scrape_filename(file_date_str)
@@ -4,19 +4,17 @@ import logging.handlers
 import math
 import os
 import random
-import re
 import subprocess
 import time
 import urllib.parse
-from datetime import date, datetime, timedelta
+from concurrent.futures import Future
+from datetime import datetime, timedelta
 from html import escape
 from time import sleep
 from urllib.parse import parse_qs, urlparse
 
 import undetected_chromedriver as uc
-import us
 import yaml
-from fake_useragent import UserAgent
 from selenium.common import (
     ElementNotInteractableException,
     NoSuchElementException,
@@ -32,52 +30,158 @@ from tenacity import (
     retry,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential_jitter,
 )
 from undetected_chromedriver import Chrome, ChromeOptions
 
 from scraper_utils import js_conditions
+from scraper_utils.browser_worker_pool import BrowserWorker, BrowserWorkerPool
+from scraper_utils.chrome_driver_manager import ChromeDriverManager
+from scraper_utils.detail_fetch_pipeline import DetailFetchPipeline
+from scraper_utils.driver_startup_cache import DriverStartupCache, get_random_user_agent
+from scraper_utils.exceptions import (
+    ElementNotFoundException,
+    RedirectedException,
+    TooManyRequestsException,
+    UnexpectedBehaviorException,
+)
+from scraper_utils.exclusion_rules import EXCLUDED_RATING, ExclusionRules
+from scraper_utils.job_detail_fetcher import JobDetailFetcher
+from scraper_utils.job_store import JobStore, get_job_id_from_url
+from scraper_utils.keyword_rater import KeywordRater, get_content_hash
+from scraper_utils.location_resolver import LocationResolver
+from scraper_utils.page_load_profiles import PageLoadProfiles, WorkerPageLoadProfiles
+from scraper_utils.page_recorder import PageRecorder, enable_performance_logging
+from scraper_utils.resource_policy import ResourcePolicy
+from scraper_utils.rate_controller import AdaptiveRateController, WorkerRateController, wait_for_rate_controller
+from scraper_utils.run_deadline import RunDeadline, stop_at_deadline
+from scraper_utils.result_cards import extract_result_cards, scroll_and_wait_for_more_results
+from scraper_utils.scrape_checkpoint import ScrapeCheckpoint
+from scraper_utils.scrape_journal import ScrapeJournal
+from scraper_utils.search_filters import (
+    BASE_SEARCH_URL,
+    build_search_url,
+    encode_search_filters,
+    results_are_sorted_by_date,
+    search_filters_were_applied,
+)
+from scraper_utils.search_planner import SearchPlanner
 
-# Global configuration for our exponential backoff
+# Global configuration for our retries, the waits between them come from the adaptive rate controller
+# and every retry gives up early once the run deadline of the decorated object has passed
 minimum_jitter = int(random.uniform(1, 3))
 maximum_jitter = int(random.uniform(8, 10))
-exponential_jitter_wait = wait_exponential_jitter(5, 7200, 3, random.uniform(minimum_jitter, maximum_jitter))
-small_retry_attempts = stop_after_attempt(2)
-medium_retry_attempts = stop_after_attempt(4)
-max_retry_attempts = stop_after_attempt(10)
+small_retry_attempts = stop_after_attempt(2) | stop_at_deadline()
+medium_retry_attempts = stop_after_attempt(4) | stop_at_deadline()
+max_retry_attempts = stop_after_attempt(10) | stop_at_deadline()
 retry_if_any_exception = retry_if_exception_type(Exception)
 
-
-class UnexpectedBehaviorException(Exception):
-    pass
-
-
-class RedirectedException(Exception):
-    pass
-
-
-class TooManyRequestsException(Exception):
-    pass
-
-
-class ElementNotFoundException(Exception):
-    pass
+# JSON object of config values that win over config.yaml, which is how the replay harness points a run at its server
+CONFIG_OVERRIDES_ENVIRONMENT_VARIABLE = "JOB_SCRAPER_CONFIG_OVERRIDES"
 
 
 class TheJobScraper:
 
-    def __init__(self):
+    def __init__(self, browser_worker: BrowserWorker = None):
+        # When running inside of a worker process the journal, checkpoint and job store are owned by the parent
+        self.browser_worker = browser_worker
         self.request_counter = 0
         self.current_working_directory = os.path.dirname(os.path.abspath(__file__))
         self.original_url = ""
         self.current_date = datetime.now().strftime("%m_%d_%Y_%H_%M")
+        self.run_started_at = datetime.now().isoformat()
         self.setup_logging()
         self.app_config, self.customizations = self.initialize_config_files()
-        self.all_jobs = self.initialize_data_files()
+        if self.browser_worker:
+            self.job_store = None
+            self.all_jobs = []
+            self.scraped_job_ids = self.browser_worker.shared_job_ids
+        else:
+            self.job_store = self.initialize_data_files()
+            self.all_jobs = self.job_store.get_all_jobs()
+            # One set of normalized job ids so duplicate checks do not have to walk the entire job history
+            self.scraped_job_ids = self.build_scraped_job_ids(self.all_jobs)
+        # Every retry, back off and unit of this run has to fit inside of this budget
+        if self.browser_worker:
+            run_deadline_at = self.browser_worker.deadline_at
+        else:
+            run_deadline_at = time.time() + self.app_config['run_time_budget_hours'] * 3600
+        self.run_deadline = RunDeadline(run_deadline_at, self.app_config['unit_time_allotment_minutes'] * 60)
+        # Paces our requests and backs off when LinkedIn starts throttling us
+        rate_controller_settings = (
+            os.path.join(self.current_working_directory, self.app_config['rate_controller_state_filepath']),
+            self.app_config['rate_initial_delay'],
+            self.app_config['rate_minimum_delay'],
+            self.app_config['rate_maximum_delay'],
+            self.app_config['rate_increase_per_success'],
+            self.app_config['rate_decrease_factor'],
+            self.app_config['rate_maximum_backoff']
+        )
+        if self.browser_worker:
+            self.rate_controller = WorkerRateController(self.browser_worker, *rate_controller_settings)
+        else:
+            self.rate_controller = AdaptiveRateController(*rate_controller_settings)
+        self.search_planner = SearchPlanner(
+            os.path.join(self.current_working_directory, self.app_config['search_planner_filepath']),
+            self.app_config['idle_runs_before_deferring'],
+            self.app_config['reprobe_deferred_every_runs']
+        )
+        # Set once a date sorted result list only shows us jobs we already know about
+        self.results_sorted_by_date = False
+        self.caught_up_with_history = False
+        # Set once the walk of a timespan reached the end of its results or caught up with the ones we know about
+        self.walked_to_end_of_results = False
+        # What we have learned about which page load conditions matter on each site
+        page_load_profiles_path = os.path.join(self.current_working_directory, self.app_config['page_load_profiles_filepath'])
+        if self.browser_worker:
+            self.page_load_profiles = WorkerPageLoadProfiles(self.browser_worker, page_load_profiles_path)
+        else:
+            self.page_load_profiles = PageLoadProfiles(page_load_profiles_path)
+        # Images, fonts and tracking beacons are blocked before Chrome fetches them
+        self.resource_policy = None
+        if self.app_config['block_resources']:
+            self.resource_policy = ResourcePolicy(
+                self.app_config['blocked_resource_types'],
+                self.app_config['blocked_url_patterns']
+            )
+        # One patched chromedriver per Chrome version is kept around instead of patching a new one for every browser
+        self.driver_startup_cache = DriverStartupCache(
+            os.path.join(self.current_working_directory, self.app_config['driver_cache_directory']),
+            os.path.abspath(os.path.join(self.current_working_directory, self.app_config['chrome_driver_executable_path']))
+        )
+        # Every page and XHR fragment of the run is saved so it can be replayed offline by the replay server
+        self.page_recorder = None
+        if self.app_config['record_pages']:
+            recording_directory = os.path.join(self.current_working_directory, self.app_config['recording_directory'], self.current_date)
+            # Every worker keeps its own recording as they would otherwise fight over the manifest
+            if self.browser_worker:
+                recording_directory = os.path.join(recording_directory, f"worker_{self.browser_worker.worker_id}")
+            self.page_recorder = PageRecorder(recording_directory)
+        self.base_search_url = BASE_SEARCH_URL
+        if self.app_config['replay_base_url']:
+            self.base_search_url = self.app_config['replay_base_url'] + "/jobs/search?"
+        # The browser is started lazily when the first unit asks for it and then kept warm across units
         self.driver = None
-        self.start_a_fresh_chrome_driver()
+        self.chrome_driver_manager = ChromeDriverManager(
+            self.initialize_chrome_driver,
+            self.app_config['max_units_per_chrome_driver'],
+            minimum_jitter,
+            maximum_jitter
+        )
+        self.job_detail_fetcher = self.initialize_job_detail_fetcher()
+        self.detail_fetch_pipeline = self.initialize_detail_fetch_pipeline()
+        # Job postings whose details are still being fetched in the background by the detail fetch pipeline
+        self.pending_job_postings = []
         self.logging_number = 0
         self.new_job_scrapes = []
+        if self.browser_worker:
+            self.scrape_journal = self.browser_worker
+            self.scrape_checkpoint = self.browser_worker
+        else:
+            self.scrape_journal = self.initialize_scrape_journal()
+            self.scrape_checkpoint = ScrapeCheckpoint(
+                os.path.join(self.current_working_directory, self.app_config['checkpoint_filepath']),
+                self.app_config['checkpoint_max_age_hours']
+            )
         self.good_jobs = []
         self.bad_jobs = []
         self.current_search = ""
@@ -88,6 +192,13 @@ class TheJobScraper:
         # is set by the customizations['minimum_good_results_per_search_per_location']
         # This helps lower the amount of work that needs to happen
         self.new_good_job_scrapes_for_search = 0
+        # Built once per run as every result card needs its location picked out of its text
+        self.location_resolver = LocationResolver(self.customizations['excluded_locations'] + self.customizations['locations'])
+        self.exclusion_rules = ExclusionRules.from_customizations(self.customizations)
+        self.keyword_rater = KeywordRater(self.customizations['word_weights'])
+        # What every search in each location has cost and found, which the search planner uses to order them
+        self.postings_seen_for_search = 0
+        self.duplicates_for_search = 0
         self.log("Successfully initialized the job scraper")
         self.log(f"\n-----\nApplication Configuration:\n{self.app_config}\n-----")
         self.log(f"\n-----\nSearch Customizations:\n{self.customizations}\n-----")
@@ -134,57 +245,110 @@ class TheJobScraper:
         self.save_new_job_scrapes()
         self.log("Adding to our new job scrapes to our main job scrape data file")
         self.update_main_job_posting_data()
+        self.page_load_profiles.save()
+        if self.page_recorder:
+            self.page_recorder.save()
+        if self.resource_policy:
+            self.log(self.resource_policy.get_summary())
+        self.log("Discarding the scrape journal now that it has been folded into the job store")
+        self.scrape_journal.discard()
+        self.scrape_checkpoint.clear()
     
     def update_main_job_posting_data(self):
+        # Only the re-rated postings and the postings from this run are written to the job store
+        upserted_jobs = self.job_store.upsert_jobs(self.new_job_scrapes)
+        self.log(f"Upserted {upserted_jobs} new job postings into the job store")
         self.update_main_job_posting_data_ratings()
-        new_all_jobs = self.new_job_scrapes + self.all_jobs
-        new_all_jobs.sort(key=lambda x: x['rating'], reverse=True)
-        self.save_job_scrape(new_all_jobs, os.path.join(self.current_working_directory, self.app_config['jobs_filepath']))
-        self.update_timespan_based_job_posting_data(new_all_jobs)
-    
-    def update_timespan_based_job_posting_data(self, new_job_postings: list[dict]) -> None:
-        last_day = []
-        last_week = []
-        last_month = []
-        today_date = date.today()
-        yesterday_date = today_date - timedelta(days=1)
-        last_week_date = today_date - timedelta(days=7)
-        last_month_date = today_date - timedelta(days=30)
-        for job_posting in new_job_postings:
-            if not job_posting['posted_time'] or "Excluded Jobs" in job_posting['posted_time']:
-                continue
-            post_date = date.fromisoformat(job_posting['posted_time'])
-            if post_date >= yesterday_date:
-                last_day.append(job_posting)
-            if post_date >= last_week_date:
-                last_week.append(job_posting)
-            if post_date >= last_month_date:
-                last_month.append(job_posting)
-        self.save_job_scrape(last_day, os.path.join(self.current_working_directory, "scrapes/past_day.json"))
-        self.save_job_scrape(last_week, os.path.join(self.current_working_directory, "scrapes/past_week.json"))
-        self.save_job_scrape(last_month, os.path.join(self.current_working_directory, "scrapes/past_month.json"))
-        
+
     def update_main_job_posting_data_ratings(self) -> None:
-        updated_all_jobs = []
-        for job in self.all_jobs:
-            if not job['content']:
-                updated_all_jobs.append(job)
+        # Only jobs rated with other word_weights or whose content changed since they were rated need re-rating
+        weights_fingerprint = self.keyword_rater.fingerprint
+        self.job_store.save_word_weights(weights_fingerprint, self.keyword_rater.word_weights)
+        rating_states = self.job_store.get_rating_states()
+        stale_jobs = []
+        for job in self.all_jobs + self.new_job_scrapes:
+            job_id = get_job_id_from_url(job['url'])
+            # Excluded jobs keep their exclusion even when they have content to rate
+            if not job['content'] or job['rating'] == EXCLUDED_RATING or job_id not in rating_states:
                 continue
-            job_content_lower = job['content'].lower()
-            new_keywords = []
-            new_rating = 0
-            for keyword, rating in self.customizations['word_weights'].items():
-                if keyword.lower() in job_content_lower:
-                    new_keywords.append(keyword)
-                    new_rating += rating
-            job['keywords'] = new_keywords
-            job['rating'] = new_rating
-            updated_all_jobs.append(job)
-        self.all_jobs = updated_all_jobs
+            content_hash = get_content_hash(job['content'])
+            if rating_states[job_id] != (weights_fingerprint, content_hash):
+                stale_jobs.append((job_id, content_hash, job))
+
+        delta_raters = {}
+        delta_jobs = []
+        full_jobs = []
+        for job_id, content_hash, job in stale_jobs:
+            previous_fingerprint, previous_content_hash = rating_states[job_id]
+            if previous_fingerprint not in delta_raters:
+                delta_raters[previous_fingerprint] = self.get_delta_rater(previous_fingerprint)
+            if previous_content_hash == content_hash and delta_raters[previous_fingerprint]:
+                delta_jobs.append((job_id, content_hash, job))
+            else:
+                full_jobs.append((job_id, content_hash, job))
+        keyword_hits = self.job_store.get_keyword_hits({job_id for job_id, _, _ in delta_jobs})
+        ratings = [
+            self.keyword_rater.rate_delta(job['content'], keyword_hits[job_id], delta_raters[rating_states[job_id][0]])
+            for job_id, _, job in delta_jobs
+        ]
+        ratings += self.keyword_rater.rate_batch([job['content'] for _, _, job in full_jobs], self.app_config['rating_processes'] or None)
+
+        rerated_jobs = []
+        new_rating_states = []
+        for (job_id, content_hash, job), (new_keywords, new_rating) in zip(delta_jobs + full_jobs, ratings):
+            new_rating_states.append((job_id, content_hash, {keyword.lower() for keyword in new_keywords}))
+            new_keywords = ','.join(new_keywords)
+            if job['keywords'] != new_keywords or job['rating'] != new_rating:
+                job['keywords'] = new_keywords
+                job['rating'] = new_rating
+                rerated_jobs.append(job)
+        self.log(f"Re-rated {len(rerated_jobs)} previously scraped job postings out of {len(stale_jobs)} stale ones ({len(delta_jobs)} from their keyword hits)")
+        self.job_store.update_ratings(rerated_jobs)
+        self.job_store.save_rating_states(weights_fingerprint, new_rating_states)
+
+    def get_delta_rater(self, previous_fingerprint: str) -> KeywordRater:
+        # Rating from the keyword hits only pays off when just a few weights changed since the jobs were rated
+        previous_word_weights = self.job_store.get_word_weights(previous_fingerprint) if previous_fingerprint else None
+        if previous_word_weights is None:
+            return None
+        if len(self.keyword_rater.get_changed_keywords(previous_word_weights)) > self.app_config['delta_rerate_max_changed_keywords']:
+            return None
+        return self.keyword_rater.get_delta_rater(previous_word_weights)
+
+    @staticmethod
+    def get_job_id_from_url(url: str) -> str:
+        return get_job_id_from_url(url)
+
+    def build_scraped_job_ids(self, job_postings: list[dict]) -> set[str]:
+        scraped_job_ids = set()
+        for job in job_postings:
+            job_id = self.get_job_id_from_url(job['url'])
+            if job_id:
+                scraped_job_ids.add(job_id)
+        logging.info(f"Built the duplicate index with {len(scraped_job_ids)} previously scraped job ids")
+        return scraped_job_ids
+
+    def add_new_job_scrape(self, job_posting_json: dict, write_to_journal: bool = True) -> None:
+        if write_to_journal:
+            self.scrape_journal.append(job_posting_json)
+        self.new_job_scrapes.append(job_posting_json)
+        job_id = self.get_job_id_from_url(job_posting_json['url'])
+        if job_id:
+            self.scraped_job_ids.add(job_id)
+
+    def reserve_job_id(self, url: str) -> None:
+        job_id = self.get_job_id_from_url(url)
+        if job_id:
+            self.scraped_job_ids.add(job_id)
+
+    def release_job_id(self, url: str) -> None:
+        job_id = self.get_job_id_from_url(url)
+        if job_id:
+            self.scraped_job_ids.discard(job_id)
 
     def save_new_job_scrapes(self) -> None:
         new_job_scrapes_filename = self.current_date + ".json"
-        new_job_scrapes_path = os.path.abspath(os.path.join(self.current_working_directory, "scrapes", new_job_scrapes_filename))
+        new_job_scrapes_path = os.path.abspath(os.path.join(self.current_working_directory, self.app_config['new_job_scrapes_directory'], new_job_scrapes_filename))
         self.save_job_scrape(self.good_jobs + self.bad_jobs, new_job_scrapes_path)
 
     def organize_and_sort_new_job_postings(self) -> None:
@@ -200,46 +364,121 @@ class TheJobScraper:
 
     def iterate_over_searches(self) -> None:
         searches = list(set(self.customizations['searches']))
-        for search in searches:
-            self.log(f"Scraping LinkedIn for jobs with the keyword '{search}'")
-            self.current_search = search
-            self.new_good_job_scrapes_for_search = 0
-            # For each search phrase in our customizations we will need to search for jobs at each location
-            self.iterate_over_locations(search)
-
-    def iterate_over_locations(self, search: str) -> None:
         locations = list(set(self.customizations['locations']))
-        # For each location we will take our search phrase and check for jobs across the three timespans
-        for location in locations:
-            self.current_location = location
-            self.log(f"Scraping jobs for in '{location}'")
-            self.iterate_over_timespans(search, location)
-            self.log(f"Finished with '{location}' and got {self.new_good_job_scrapes_for_search} new good posts")
+        # Every search phrase in our customizations gets searched for at each location
+        units = [(search, location) for search in searches for location in locations]
+        if self.app_config['order_searches_by_yield']:
+            units = self.search_planner.plan_units(units)
+            self.log(f"Planned {len(units)} of the {len(searches) * len(locations)} searches in order of their expected yield")
+        if self.app_config['browser_workers'] > 1:
+            self.log(f"Spreading the searches across {self.app_config['browser_workers']} browser workers")
+            BrowserWorkerPool(self, self.app_config['browser_workers']).run(units)
+            return
+        for unit_number, (search, location) in enumerate(units):
+            if self.run_deadline.is_run_expired():
+                self.log(f"The run is out of time so we are skipping the last {len(units) - unit_number} searches")
+                return
+            self.scrape_search_location(search, location)
+
+    def scrape_search_location(self, search: str, location: str) -> None:
+        self.current_search = search
+        self.current_location = location
+        self.new_good_job_scrapes_for_search = 0
+        self.postings_seen_for_search = 0
+        self.duplicates_for_search = 0
+        starting_request_counter = self.request_counter
+        start_time = time.time()
+        self.log(f"Scraping jobs for '{search}' in '{location}'")
+        self.run_deadline.start_unit()
+        try:
+            walked_a_timespan = self.iterate_over_timespans(search, location)
+        finally:
+            self.run_deadline.end_unit()
+            if self.page_recorder:
+                self.page_recorder.save()
+        self.log(f"Finished with '{location}' and got {self.new_good_job_scrapes_for_search} new good posts")
+        # A unit the checkpoint or the deadline skipped entirely says nothing about what it yields
+        if not walked_a_timespan:
             self.new_good_job_scrapes_for_search = 0
+            return
+        self.record_search_location_run({
+            "new_good_jobs": self.new_good_job_scrapes_for_search,
+            "postings_seen": self.postings_seen_for_search,
+            "duplicates": self.duplicates_for_search,
+            "requests": self.request_counter - starting_request_counter,
+            "seconds": round(time.time() - start_time, 1),
+        })
+        self.new_good_job_scrapes_for_search = 0
 
-    def iterate_over_timespans(self, search: str, location: str) -> None:
+    def iterate_over_timespans(self, search: str, location: str) -> bool:
         # Now that we have our search phrase and our location we can actually start scraping jobs
         timespan_map = {
             "day": self.app_config['past_day_button'],
             "week": self.app_config['past_week_button'],
             "month": self.app_config['past_month_button']
         }
-        for timespan, timespan_button_path in timespan_map.items():
+        # The timespans are nested so we only need the narrowest one that covers the time since we last scraped
+        if self.app_config['skip_overlapping_timespans']:
+            timespans = self.search_planner.plan_timespans(search, location)
+            self.log(f"Only the '{timespans}' timespans are needed since this was last scraped")
+        else:
+            timespans = list(timespan_map.keys())
+        all_timespans_completed = True
+        # Only a search that was walked all the way through may narrow the timespans of the next run
+        walked_every_timespan_to_the_end = True
+        walked_a_timespan = False
+        for timespan in timespans:
+            if self.run_deadline.is_expired():
+                self.log(f"Ran out of time for '{search}' in '{location}' so we are skipping the rest of it")
+                all_timespans_completed = False
+                break
+            timespan_button_path = timespan_map[timespan]
             self.current_timespan = timespan
+            if self.scrape_checkpoint.is_unit_completed(search, location, timespan):
+                self.log("Skipping as this was already completed according to our checkpoint")
+                walked_every_timespan_to_the_end = False
+                continue
             self.log(f"Checking last '{timespan}' with {self.new_good_job_scrapes_for_search} good posts found so far")
+            walked_a_timespan = True
             try:
                 _ = self.get_job_postings(search, location, timespan, timespan_button_path)
+                # A unit that ran out of time is left in the checkpoint to be picked up again next run
+                if self.run_deadline.is_expired():
+                    all_timespans_completed = False
+                    continue
+                self.scrape_checkpoint.complete_unit(search, location, timespan)
+                if not self.walked_to_end_of_results:
+                    walked_every_timespan_to_the_end = False
             except RetryError as e:
+                all_timespans_completed = False
+                if self.run_deadline.is_expired():
+                    self.log(f"Ran out of time for '{search}' in '{location}' for the last '{timespan}'")
+                    continue
                 self.log(f"Failed to get job postings for '{search}' in '{location}' for the last '{timespan}'")
                 self.log(f"Error: {e}")
-                pass
+        if all_timespans_completed and walked_every_timespan_to_the_end:
+            self.record_search_location_scraped(search, location)
+        return walked_a_timespan
+
+    def record_search_location_scraped(self, search: str, location: str) -> None:
+        if self.browser_worker:
+            self.browser_worker.record_scraped(search, location, self.run_started_at)
+        else:
+            self.search_planner.record_scraped(search, location, self.run_started_at)
+
+    def record_search_location_run(self, run_stats: dict) -> None:
+        if self.browser_worker:
+            self.browser_worker.record_run(self.current_search, self.current_location, run_stats)
+        else:
+            self.search_planner.record_run(self.current_search, self.current_location, run_stats)
 
     @retry(
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=max_retry_attempts,
         reraise=False
     )
     def get_job_postings(self, search: str, location: str, timespan: str, timespan_button_path: str) -> bool:
+        self.walked_to_end_of_results = False
         # Quick breakout check that will prevent us from doing extra work should we already be over the min threshold
         if self.new_good_job_scrapes_for_search >= self.customizations['minimum_good_results_per_search_per_location']:
             self.log("Breaking out because we have found enough good jobs")
@@ -247,10 +486,43 @@ class TheJobScraper:
         self.log(f"Attempt '{self.get_job_postings.retry.statistics['attempt_number']}' on getting job postings for '{search}' in '{location}' for the last '{timespan}'")
         if self.get_job_postings.retry.statistics['attempt_number'] == max_retry_attempts:
             self.log("!!!WARNING!!! This is our last attempt to do this. If it fails we will just move on")
-        self.log("Loading a fresh browser session to start the job scraping process")
-        self.start_a_fresh_chrome_driver()
-        self.log("Inputting search phrase and location")
-        self.input_search_phrase_and_location(search, location)
+        if self.get_job_postings.retry.statistics['attempt_number'] > 1:
+            self.log("Loading a fresh browser session as the previous attempt failed")
+            self.start_a_fresh_chrome_driver()
+        else:
+            self.log("Preparing a warm browser session to start the job scraping process")
+            self.driver = self.chrome_driver_manager.get_driver_for_new_unit()
+        self.results_sorted_by_date = False
+        self.caught_up_with_history = False
+        # One navigation with the filters in the URL, and the click based filtering is kept as the fallback
+        filters_applied = self.app_config['url_search_filters'] and self.apply_search_filters_through_url(search, location, timespan)
+        if not filters_applied:
+            self.log("Inputting search phrase and location")
+            self.input_search_phrase_and_location(search, location)
+            self.apply_search_filters_by_clicking(timespan, timespan_button_path)
+        if self.there_are_still_results():
+            self.log("Getting all job postings that are displayed on the page")
+            self.get_all_job_postings()
+        else:
+            self.walked_to_end_of_results = True
+        return True
+
+    def apply_search_filters_through_url(self, search: str, location: str, timespan: str) -> bool:
+        search_filters = encode_search_filters(
+            timespan,
+            self.customizations['include_hybrid_jobs'],
+            self.customizations['experience_levels']
+        )
+        self.log(f"Inputting search phrase and location with the search filters {search_filters}")
+        self.input_search_phrase_and_location(search, location, search_filters, self.app_config['sort_results_by_date'])
+        if search_filters_were_applied(self.driver.current_url, search_filters):
+            self.log("Search filters were applied through the URL")
+            self.results_sorted_by_date = results_are_sorted_by_date(self.driver.current_url)
+            return True
+        self.log("Search filters did not survive the page load so we are falling back to clicking through them")
+        return False
+
+    def apply_search_filters_by_clicking(self, timespan: str, timespan_button_path: str) -> None:
         if self.there_are_still_results():
             self.log(f"Filtering by timespan '{timespan}'")
             self.filter_results_timespan(timespan_button_path)
@@ -271,10 +543,6 @@ class TheJobScraper:
             except RetryError:
                 self.log("Failed to select experience levels but this is not fatal so we will continue on")
                 pass
-        if self.there_are_still_results():
-            self.log("Getting all job postings that are displayed on the page")
-            self.get_all_job_postings()
-        return True
 
     def there_are_still_results(self) -> bool:
         try:
@@ -285,32 +553,27 @@ class TheJobScraper:
             return True
         
     def start_a_fresh_chrome_driver(self) -> None:
-        if self.driver:
-            self.driver.quit()
-            sleep(random.uniform(minimum_jitter, maximum_jitter))
-        self.driver = self.initialize_chrome_driver()
+        self.driver = self.chrome_driver_manager.restart()
 
     @retry(
         retry=retry_if_any_exception,
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=medium_retry_attempts,
         reraise=True
     )
-    def input_search_phrase_and_location(self, search: str, location: str) -> None:
+    def input_search_phrase_and_location(self, search: str, location: str, search_filters: dict = None, sort_by_date: bool = False) -> None:
         attempt_number = self.input_search_phrase_and_location.retry.statistics['attempt_number']
         if attempt_number > 1:
             self.log(f"Caught an exception on attempt {attempt_number} of inputting search and location so we are reloading the entire browser")
             self.start_a_fresh_chrome_driver()
         # This is much easier than trying to deal with XPATH
-        base_url_string = "https://www.linkedin.com/jobs/search?"
-        search_params = f"keywords={search}&location={location}".replace(" ", "%20")
-        url_string = base_url_string + search_params
+        url_string = build_search_url(search, location, search_filters, sort_by_date, self.base_search_url)
         self.log(f"Loading the URL: '{url_string}'")
         self.load_url(url_string)
 
     @retry(
         retry=retry_if_any_exception,
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=medium_retry_attempts,
         reraise=True
     )
@@ -343,7 +606,7 @@ class TheJobScraper:
 
     @retry(
         retry=retry_if_any_exception,
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=medium_retry_attempts,
         reraise=False
     )
@@ -369,7 +632,7 @@ class TheJobScraper:
 
     @retry(
         retry=retry_if_any_exception,
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=medium_retry_attempts,
         reraise=False
     )
@@ -415,11 +678,27 @@ class TheJobScraper:
         raise ElementNotFoundException("Could not find any experience level checkboxes")
 
     def get_all_job_postings(self) -> None:
-        previous_index = 0
+        try:
+            self.scroll_through_all_job_postings()
+        finally:
+            self.finish_pending_job_postings(wait=True)
+
+    def scroll_through_all_job_postings(self) -> None:
+        # When resuming a unit we skip over the results that were already checked before the crash
+        previous_index = self.scrape_checkpoint.get_offset(self.current_search, self.current_location, self.current_timespan)
+        if previous_index:
+            self.log(f"Resuming this search from result {previous_index} according to our checkpoint")
         iteration = 0
         for _ in range(0, 25):
             if self.new_good_job_scrapes_for_search >= self.customizations['minimum_good_results_per_search_per_location']:
                 return
+            if self.run_deadline.is_expired():
+                self.log("Ran out of time while scrolling through the job postings")
+                return
+            if self.caught_up_with_history:
+                self.log("We have caught up with the jobs we already know about so we are done with this search")
+                self.walked_to_end_of_results = True
+                return
             iteration += 1
             if iteration > 1:
                 if self.is_page_sign_in_form():
@@ -430,12 +709,17 @@ class TheJobScraper:
             results_list = self.get_job_results_list()
             self.log(f"{len(results_list)} jobs have been loaded on the screen for the job posting scrape")
             self.get_all_job_posting_objects(previous_index)
+            self.finish_pending_job_postings(wait=False)
             self.log(f"Updating the starting point from {previous_index} to {len(results_list)}")
-            previous_index = len(results_list)
+            previous_index = max(previous_index, len(results_list))
+            self.scrape_checkpoint.update_offset(self.current_search, self.current_location, self.current_timespan, previous_index)
             if not more_jobs_to_load:
                 self.log("There are no more jobs to load")
                 self.save_debug_data("more_jobs", True, True)
+                self.walked_to_end_of_results = True
                 return
+        # Catching up on the last iteration still means there is nothing older left that we do not know about
+        self.walked_to_end_of_results = self.caught_up_with_history
         self.log("We have reached our limited of 25 iterations of getting all job postings")
         return
 
@@ -444,23 +728,38 @@ class TheJobScraper:
         self.log(f"Scrolling to the infinite bottom with {len(results_list)} job postings loaded on the screen")
         # We do not use while true here as a safety precaution against never ending scrolling
         for _ in range(0, 25):
-            self.driver.execute_script(self.app_config['scroll_to_bottom_script'])
-            self.load_url()
-            page_height_script = self.driver.execute_script(self.app_config['page_height_script']) - 1
-            total_scrolled_height = self.driver.execute_script(self.app_config['total_scrolled_height'])
-            if page_height_script <= total_scrolled_height:
+            if self.scrolled_to_the_bottom():
+                # The full 429 and redirect checks only need to happen once per batch instead of after every scroll
+                self.load_url()
                 try:
                     self.find_and_press_see_more_jobs_button(len(results_list))
                     return True
                 except RetryError:
                     self.log("Ran out of attempts to find and press the see more jobs button")
                     return False
+        self.load_url()
         self.log("We have scrolled to the bottom 25 times and have not found the more jobs button so we are breaking out")
         return True
+
+    def scrolled_to_the_bottom(self) -> bool:
+        # Only waits for the results list to grow or for the end of the results instead of a full page load
+        scroll_result = scroll_and_wait_for_more_results(
+            self.driver,
+            self.app_config['job_results_list'],
+            self.app_config['end_of_results'],
+            self.app_config['scroll_wait_timeout']
+        )
+        if scroll_result:
+            return scroll_result['atBottom']
+        self.driver.execute_script(self.app_config['scroll_to_bottom_script'])
+        self.load_url()
+        page_height_script = self.driver.execute_script(self.app_config['page_height_script']) - 1
+        total_scrolled_height = self.driver.execute_script(self.app_config['total_scrolled_height'])
+        return page_height_script <= total_scrolled_height
     
     @retry(
         retry=retry_if_any_exception,
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=small_retry_attempts,
         reraise=False
     )
@@ -534,35 +833,58 @@ class TheJobScraper:
     def get_all_job_posting_objects(self, starting_index: int) -> None:
         all_job_postings = self.get_job_results_list()
         self.log(f"Checking results from {starting_index}->{len(all_job_postings)}")
+        # One round trip for the text, link and date of every card instead of several per card
+        result_cards = extract_result_cards(self.driver, self.app_config['job_results_list'], starting_index)
+        if not result_cards:
+            self.log("Bulk extraction of the result cards failed so each card will be read individually")
         duplicates = 0
         excluded_jobs = 0
         valid_jobs = 0
+        pending_jobs = 0
+        consecutive_duplicates = 0
         for job_posting_number, job_posting in enumerate(all_job_postings[starting_index:]):
-            job_posting_object = JobPosting(job_posting, job_posting_number, self)
+            if self.run_deadline.is_expired():
+                self.log("Ran out of time while checking this batch of job postings")
+                break
+            result_card = result_cards[job_posting_number] if job_posting_number < len(result_cards) else None
+            job_posting_object = JobPosting(job_posting, job_posting_number, self, result_card)
+            self.postings_seen_for_search += 1
             try:
                 if job_posting_object.is_a_duplicate():
                     self.log(f"Job posting {job_posting_number} was a duplicate")
                     duplicates += 1
+                    self.duplicates_for_search += 1
+                    consecutive_duplicates += 1
+                    # Results sorted by date that only show known jobs means everything after this is older and known too
+                    if self.results_sorted_by_date and consecutive_duplicates >= self.app_config['caught_up_after_consecutive_duplicates']:
+                        self.log(f"Found {consecutive_duplicates} known jobs in a row in the date sorted results")
+                        self.caught_up_with_history = True
+                        break
                     continue
+                consecutive_duplicates = 0
                 if job_posting_object.is_a_excluded_title_or_company_or_location():
                     job_posting_details = f"'{job_posting_object.title}' at '{job_posting_object.company}' in '{job_posting_object.location}'"
                     self.log(f"Job posting {job_posting_number}, {job_posting_details}, in on the exclusion list")
                     excluded_jobs += 1
                     job_posting_object_json = job_posting_object.get_job_posting_json_data()
-                    self.new_job_scrapes.append(job_posting_object_json)
+                    self.add_new_job_scrape(job_posting_object_json)
                     continue
-                job_posting_object.request_job_posting()
-                if job_posting_object.is_a_excluded_industry():
-                    self.log(f"Job posting {job_posting_number}, '{job_posting_object.industry}', on exclusion list")
-                    excluded_jobs += 1
-                    job_posting_object_json = job_posting_object.get_job_posting_json_data()
-                    self.new_job_scrapes.append(job_posting_object_json)
+                if self.detail_fetch_pipeline:
+                    # The details get fetched in the background while we keep scrolling through the results
+                    job_details_future = self.detail_fetch_pipeline.submit(job_posting_object.url)
+                    # Reserved right away so the same posting showing up again is not queued a second time
+                    self.reserve_job_id(job_posting_object.url)
+                    self.pending_job_postings.append((job_posting_number, job_posting_object, job_details_future))
+                    pending_jobs += 1
                     continue
-                job_posting_object.populate_job_posting_data()
-                job_posting_object_json = job_posting_object.get_job_posting_json_data()
-                self.new_job_scrapes.append(job_posting_object_json)
-                self.new_good_job_scrapes_for_search += 1
-                valid_jobs += 1
+                if self.job_detail_fetcher:
+                    job_posting_object.fetch_job_posting_details()
+                else:
+                    job_posting_object.request_job_posting()
+                if self.process_requested_job_posting(job_posting_object, job_posting_number):
+                    valid_jobs += 1
+                else:
+                    excluded_jobs += 1
             except Exception as e:
                 self.log(f"Job posting {job_posting_number} failed with error: {e}")
                 if self.is_page_sign_in_form():
@@ -570,7 +892,43 @@ class TheJobScraper:
                     break
                 pass
         self.log("Finished getting the job posting data for this batch")
-        self.log(f"Duplicates: {duplicates}, Exclusions: {excluded_jobs}, Valid: {valid_jobs}")
+        self.log(f"Duplicates: {duplicates}, Exclusions: {excluded_jobs}, Valid: {valid_jobs}, Pending: {pending_jobs}")
+
+    def process_requested_job_posting(self, job_posting_object: "JobPosting", job_posting_number: int) -> bool:
+        # Returns True when the job posting was a valid job and False when it was excluded by its industry
+        if job_posting_object.is_a_excluded_industry():
+            self.log(f"Job posting {job_posting_number}, '{job_posting_object.industry}', on exclusion list")
+            job_posting_object_json = job_posting_object.get_job_posting_json_data()
+            self.add_new_job_scrape(job_posting_object_json)
+            return False
+        job_posting_object.populate_job_posting_data()
+        job_posting_object_json = job_posting_object.get_job_posting_json_data()
+        self.add_new_job_scrape(job_posting_object_json)
+        self.new_good_job_scrapes_for_search += 1
+        return True
+
+    def finish_pending_job_postings(self, wait: bool) -> None:
+        if not self.pending_job_postings:
+            return
+        still_pending_job_postings = []
+        excluded_jobs = 0
+        valid_jobs = 0
+        for job_posting_number, job_posting_object, job_details_future in self.pending_job_postings:
+            if not wait and not job_details_future.done():
+                still_pending_job_postings.append((job_posting_number, job_posting_object, job_details_future))
+                continue
+            try:
+                job_posting_object.fetch_job_posting_details(job_details_future)
+                if self.process_requested_job_posting(job_posting_object, job_posting_number):
+                    valid_jobs += 1
+                else:
+                    excluded_jobs += 1
+            except Exception as e:
+                self.log(f"Job posting {job_posting_number} failed with error: {e}")
+                # It never made it into the new job scrapes so it is fair game if it shows up again
+                self.release_job_id(job_posting_object.url)
+        self.pending_job_postings = still_pending_job_postings
+        self.log(f"Finished fetched job postings with Exclusions: {excluded_jobs}, Valid: {valid_jobs}, Still pending: {len(still_pending_job_postings)}")
     
     def is_page_sign_in_form(self) -> bool:
         try:
@@ -622,6 +980,8 @@ class TheJobScraper:
             raise e   
 
     def load_url(self, url=None) -> None:
+        # Stops every retry wrapped around us from starting another page load once we are out of time
+        self.run_deadline.check()
         self.request_counter += 1
         if url:
             self.driver.get(url)
@@ -631,15 +991,28 @@ class TheJobScraper:
         self.check_for_http_too_many_requests()
         # Next we have to check to make sure that we have not been redirected
         self.check_for_redirect()
-        # Then we sprinkle in some random sleep to pretend we are human (we are not)
-        sleep(random.uniform(minimum_jitter, maximum_jitter))
+        # The page loaded cleanly so we can speed up a little and then pace ourselves before the next request
+        self.rate_controller.record_success()
+        if self.resource_policy:
+            self.resource_policy.record_page_load(self.driver)
+        if self.page_recorder:
+            self.page_recorder.record_page(self.driver)
+        self.rate_controller.wait()
 
     def wait_for_page_to_load(self) -> None:
-        js_conditions.wait_for_page_load(self.driver)
+        host = urlparse(self.driver.current_url).netloc
+        profile = self.page_load_profiles.get(host)
+        # The event driven wait blocks on a single async script and the condition chain is only our fallback
+        if self.app_config['event_driven_page_load']:
+            # Pages that never go quiet give up on it after the cap and get the condition chain instead
+            if js_conditions.wait_for_dom_quiet(self.driver, quiet_period=self.app_config['dom_quiet_period'],
+                                                timeout=self.app_config['dom_quiet_timeout'], profile=profile):
+                return
+        js_conditions.wait_for_page_load(self.driver, profile=profile)
 
     @retry(
         retry=retry_if_exception_type(RedirectedException),
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=max_retry_attempts,
         reraise=True
     )
@@ -655,11 +1028,12 @@ class TheJobScraper:
         for check in self.app_config['redirect_checks']:
             if check in parse_qs(parsed_url_queries):
                 self.original_url = str(parse_qs(parsed_url_queries)[check][0])
+                self.rate_controller.record_throttle()
                 raise RedirectedException("LinkedIn redirected us and so we need to sleep")
 
     @retry(
         retry=retry_if_exception_type(TooManyRequestsException),
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=max_retry_attempts,
         reraise=True
     )
@@ -667,21 +1041,25 @@ class TheJobScraper:
         attempt_number = self.check_for_http_too_many_requests.retry.statistics['attempt_number']
         if attempt_number > 1:
             self.log("Refreshing page as we got hit with a 429")
-            sleep(random.uniform(minimum_jitter, maximum_jitter))
+            self.rate_controller.wait()
             self.driver.refresh()
             self.wait_for_page_to_load()
         http_429_check = self.driver.find_elements(By.XPATH, self.app_config['http_429_xpath'])
         if http_429_check:
             self.save_debug_data("429_regular", True, True)
+            self.rate_controller.record_throttle()
             raise TooManyRequestsException("We have been hit with HTTP 429 and so we need to sleep")
         network_down_message = self.driver.find_elements(By.XPATH, self.app_config['linkedin_custom_429'])
         if network_down_message:
             self.save_debug_data("429_linkedin", True, True)
+            self.rate_controller.record_throttle()
             raise TooManyRequestsException("We have been hit with a network down message and so we need to sleep")
 
     def setup_logging(self) -> None:
         scraper_logs_directory = os.path.abspath(os.path.join(self.current_working_directory, "logs", "scraper"))
         log_filename = self.current_date + ".log"
+        if self.browser_worker:
+            log_filename = f"{self.current_date}_worker_{self.browser_worker.worker_id}.log"
         log_filepath = os.path.join(scraper_logs_directory, log_filename)
         logging.basicConfig(filename=log_filepath, level=logging.INFO, filemode="w")
         logging.info("Logging has been setup for job scraper")
@@ -691,10 +1069,6 @@ class TheJobScraper:
         with open(filepath, "w") as f:
             json.dump(obj=data, fp=f)
 
-    def load_json_data(self) -> dict:
-        with open(self.app_config['jobs_filepath'], "r") as f:
-            return json.load(f)
-
     @staticmethod
     def initialize_config_files() -> tuple[dict, dict]:
         if not os.path.exists("config.yaml"):
@@ -707,24 +1081,58 @@ class TheJobScraper:
             app_config = yaml.load(f, Loader=yaml.FullLoader)
         with open("customizations.yaml", "r") as f:
             customizations = yaml.load(f, Loader=yaml.FullLoader)
+        config_overrides = os.environ.get(CONFIG_OVERRIDES_ENVIRONMENT_VARIABLE)
+        if config_overrides:
+            app_config.update(json.loads(config_overrides))
         return app_config, customizations
 
-    def initialize_data_files(self) -> list:
-        # Makes sure that our JSON and HTML data files are created and ready for use
-        all_jobs_path = self.app_config['jobs_filepath']
-        if not os.path.exists(all_jobs_path):
-            self.save_job_scrape([], all_jobs_path)
-        all_jobs = self.load_json_data() or []
-        all_jobs_backup_path = all_jobs_path + ".old"
-        self.save_job_scrape(all_jobs, all_jobs_backup_path)
-        return all_jobs
+    def initialize_data_files(self) -> JobStore:
+        # Makes sure that our job database is created and that the legacy JSON job history has been imported into it
+        jobs_database_path = os.path.join(self.current_working_directory, self.app_config['jobs_database_filepath'])
+        job_store = JobStore(jobs_database_path)
+        if job_store.is_empty():
+            legacy_jobs_path = os.path.join(self.current_working_directory, self.app_config['jobs_filepath'])
+            job_store.import_json(legacy_jobs_path)
+        return job_store
     
+    def initialize_scrape_journal(self) -> ScrapeJournal:
+        # Any journal left behind by a run that was killed still holds postings that never made it into the job store
+        journal_directory = os.path.join(self.current_working_directory, self.app_config['journal_directory'])
+        scrape_journal = ScrapeJournal(journal_directory, self.current_date)
+        recovered_jobs = 0
+        for job_posting_json in scrape_journal.recover():
+            if self.get_job_id_from_url(job_posting_json['url']) in self.scraped_job_ids:
+                continue
+            self.add_new_job_scrape(job_posting_json, write_to_journal=False)
+            recovered_jobs += 1
+        logging.info(f"Recovered {recovered_jobs} job postings from previous scrape journals")
+        return scrape_journal
+
+    def initialize_job_detail_fetcher(self) -> JobDetailFetcher:
+        if not self.app_config['http_detail_fetch']:
+            return None
+        logging.info(f"Job posting details will be fetched over HTTP from '{self.app_config['detail_fetch_url_template']}'")
+        return JobDetailFetcher(
+            self.app_config['detail_fetch_url_template'],
+            self.get_random_user_agent(),
+            self.app_config['detail_fetch_timeout'],
+            self.app_config['detail_fetch_pool_size']
+        )
+
+    def initialize_detail_fetch_pipeline(self) -> DetailFetchPipeline:
+        if not self.job_detail_fetcher or not self.app_config['async_detail_fetch']:
+            return None
+        logging.info("Job posting details will be fetched in the background while scrolling")
+        return DetailFetchPipeline(
+            self.job_detail_fetcher,
+            self.app_config['detail_fetch_concurrency'],
+            self.app_config['detail_fetch_requests_per_second'],
+            self.app_config['detail_fetch_burst']
+        ).start()
+
     def get_random_user_agent(self) -> str:
-        agents = UserAgent()
-        platforms_choices = [item for item in agents.platforms if item != "mobile" and item != "tablet"]
-        os_choices = [item for item in agents.os if item != "android" and item != "ios"]
-        user_agent = UserAgent(os=os_choices, platforms=platforms_choices)
-        random_agent = user_agent.random
+        # The user agent pool is only built once per process
+        random_agent = get_random_user_agent()
         logging.info(f"Setting user agent to be '{random_agent}'")
         return random_agent
 
@@ -738,23 +1146,37 @@ class TheJobScraper:
         ublock_path = os.path.abspath(os.path.join(self.current_working_directory, "ublock"))
         options.add_argument('--load-extension=' + ublock_path)
         logging.info("uBlock extension added to Chrome driver")
-        chrome_driver_executable_path = os.path.abspath(os.path.join(self.current_working_directory, self.app_config['chrome_driver_executable_path']))
+        if self.page_recorder:
+            # The recorder reads the XHR responses out of the performance log
+            enable_performance_logging(options)
+        chrome_driver_executable_path = self.driver_startup_cache.get_patched_chromedriver()
         logging.info(f"Chrome driver executable path is '{chrome_driver_executable_path}'")
-        return uc.Chrome(executable_path=chrome_driver_executable_path, options=options)
+        driver = uc.Chrome(driver_executable_path=chrome_driver_executable_path, options=options)
+        if self.resource_policy:
+            self.resource_policy.apply(driver)
+        return driver
 
 
 class JobPosting:
 
-    def __init__(self, element: WebElement, element_index: int, job_scraper_object: TheJobScraper):
+    def __init__(self, element: WebElement, element_index: int, job_scraper_object: TheJobScraper, result_card: dict = None):
         # Properties from the job scraper
         self.job_scraper = job_scraper_object
+        self.rate_controller = job_scraper_object.rate_controller
+        self.run_deadline = job_scraper_object.run_deadline
         self.posting_element = element
         self.element_index = element_index
-        self.previously_scraped_jobs = job_scraper_object.all_jobs
-        self.newly_scraped_jobs = job_scraper_object.new_job_scrapes
+        # Pre-extracted card data from extract_result_cards which saves us the WebDriver round trips
+        self.result_card = result_card
+        # Details parsed from the job view HTML when they were fetched over HTTP instead of in the browser
+        self.job_details = None
+        self.scraped_job_ids = job_scraper_object.scraped_job_ids
         self.driver = job_scraper_object.driver
         self.app_config = job_scraper_object.app_config
         self.customizations = job_scraper_object.customizations
+        self.location_resolver = job_scraper_object.location_resolver
+        self.exclusion_rules = job_scraper_object.exclusion_rules
+        self.keyword_rater = job_scraper_object.keyword_rater
         self.current_search = job_scraper_object.current_search
         # Actual job posting properties
         self.url_element = WebElement
@@ -794,25 +1216,22 @@ class JobPosting:
         if not self.url:
             self.log("Could not get a valid URL for the job posting...skipping")
             return True
-        split_newly_found_job_url = self.url.split("/view/")
-        if len(split_newly_found_job_url) != 2:
+        newly_found_job_url = self.job_scraper.get_job_id_from_url(self.url)
+        if not newly_found_job_url:
             self.log(f"Failed to split the URL, '{self.url}', for the job posting...skipping")
             return True
-        newly_found_job_url = split_newly_found_job_url[1].lower()
         self.log(f"Checking if the job posting URL, '{newly_found_job_url}', has been previously scraped")
-        for job in (self.newly_scraped_jobs + self.previously_scraped_jobs):
-            if not job['url']:
-                continue
-            previously_found_job_url = job['url'].split("/view/")[1].lower()
-            duplicate_job_posting_url = previously_found_job_url == newly_found_job_url
-            if duplicate_job_posting_url:
-                self.log("Job posting has been previously scraped...skipping")
-                return True
+        if newly_found_job_url in self.scraped_job_ids:
+            self.log("Job posting has been previously scraped...skipping")
+            return True
         return False
 
     def get_job_posting_url_pre_request(self) -> None:
-        self.url_element = self.get_web_element(By.TAG_NAME, 'a', self.posting_element)
-        full_url = self.url_element.get_property(name="href")
+        if self.result_card and self.result_card['url']:
+            full_url = self.result_card['url']
+        else:
+            self.url_element = self.get_web_element(By.TAG_NAME, 'a', self.posting_element)
+            full_url = self.url_element.get_property(name="href")
         self.log(f"Setting the job posting URL to '{full_url}'") 
         self.url = full_url.split("?")[0]
 
@@ -822,25 +1241,25 @@ class JobPosting:
         except UnexpectedBehaviorException as e:
             self.log(f"Failed to parse the posting element text: {e}\nSkipping this job posting")
             return True
-        if any(t for t in self.customizations['excluded_title_keywords'] if t.lower().strip() in self.title.lower()):
-            self.keywords.append("TITLE")
-            self.rating = -999
-            self.log(f"Skipping as '{self.title}' is in our exclusion list")
-            return True
-        if any(c for c in self.customizations['excluded_companies'] if c.lower().strip() in self.company.lower()):
-            self.keywords.append("COMPANY")
-            self.rating = -999
-            self.log(f"Skipping as '{self.company}' is in our exclusion list")
-            return True
-        if any(l for l in self.customizations['excluded_locations'] if l.lower().strip() in self.location.lower()):
-            self.keywords.append("LOCATION")
-            self.rating = -999
-            self.log(f"Skipping as '{self.location}' is in our exclusion list")
+        exclusion_reason = self.exclusion_rules.get_exclusion_reason(self.title, self.company, self.location)
+        if exclusion_reason:
+            self.keywords.append(exclusion_reason)
+            self.rating = EXCLUDED_RATING
+            self.log(f"Skipping '{self.title}' at '{self.company}' in '{self.location}' as its {exclusion_reason.lower()} is in our exclusion list")
             return True
         return False
     
     def parse_posting_element_text(self) -> None:
-        posting_element_text = self.posting_element.text.strip().split("\n")
+        if self.result_card and self.result_card['title'] and self.result_card['company'] and self.result_card['location']:
+            self.title = self.clean_string(self.result_card['title'])
+            self.company = self.clean_string(self.result_card['company'])
+            self.location = self.clean_string(self.result_card['location'])
+            self.log(f"Job title, company, and location have been set to '{self.title}', '{self.company}', and '{self.location}'")
+            return
+        if self.result_card:
+            posting_element_text = self.result_card['text'].strip().split("\n")
+        else:
+            posting_element_text = self.posting_element.text.strip().split("\n")
         if len(posting_element_text) == 0:
             raise UnexpectedBehaviorException("Could not find any text in the posting element")
         self.log(f"Parsing the posting element text for job title: '{posting_element_text}'")
@@ -879,47 +1298,14 @@ class JobPosting:
                     return
     
     def pop_location_from_posting_element_text(self, posting_element_text: list[str]) -> None:
-        location = "Unknown"
-        # First we try and get an easy win by looking for the state abbreviation 
-        location_pattern = r", ([A-Z][A-Z])$"
-        states = us.states.STATES_AND_TERRITORIES
-        us_state_abbreviations = [state.abbr for state in states]
-        us_state_abbreviations.append("DC")
-        for i, element in enumerate(posting_element_text):
-            match = re.search(location_pattern, element)
-            if not match:
-                continue
-            state_abbreviation = match.group(1)
-            if state_abbreviation not in us_state_abbreviations:
-                continue
-            location = posting_element_text.pop(i)
-            self.location = self.clean_string(location)
-            self.log(f"Job location has been set to '{self.location}'")
+        # State abbreviations, the United States, our customization locations and then metro areas in one pass
+        location_index = self.location_resolver.find_location_index(posting_element_text)
+        if location_index is None:
+            self.log("Unable to find a location string using the excluded locations list. This is bad.")
             return
-        self.log("Unable to find a location string using state abbreviations")
-        # Maybe the locations is just ye ole United States
-        for i, element in enumerate(posting_element_text):
-            if "United States" in element:
-                location = posting_element_text.pop(i)
-                self.location = self.clean_string(location)
-                self.log(f"Job location has been set to '{self.location}'")
-                return
-        self.log("Unable to find a location string using United States")
-        # Next logical thing to try is our excluded locations and locations list from the customizations file
-        for i, element in enumerate(posting_element_text):
-            if any(l for l in (self.customizations['excluded_locations'] + self.customizations['locations']) if l.lower().strip() in element.lower()):
-                location = posting_element_text.pop(i)
-                self.location = self.clean_string(location)
-                self.log(f"Job location has been set to '{self.location}'")
-                return
-        # Based off of testing one last ditch effort to determine the location is to see if there is an element that ends in 'Area'
-        for i, element in enumerate(posting_element_text):
-            if element.endswith(" Area"):
-                location = posting_element_text.pop(i)
-                self.location = self.clean_string(location)
-                self.log(f"Job location has been set to '{self.location}'")
-                return
-        self.log("Unable to find a location string using the excluded locations list. This is bad.")
+        location = posting_element_text.pop(location_index)
+        self.location = self.clean_string(location)
+        self.log(f"Job location has been set to '{self.location}'")
     
     def pop_unwanted_elements_from_posting_element_text(self, posting_element_text: list[str]) -> None:
         unwanted_elements = [
@@ -948,7 +1334,7 @@ class JobPosting:
 
     @retry(
         retry=retry_if_exception_type((TooManyRequestsException, NoSuchElementException)),
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=medium_retry_attempts,
         reraise=False
     )
@@ -960,20 +1346,43 @@ class JobPosting:
         self.url_element = self.get_web_element(By.TAG_NAME, 'a', self.posting_element)
         self.url_element.click()
         self.job_scraper.request_counter += 1
-        sleep(random.uniform(minimum_jitter, maximum_jitter))
+        self.rate_controller.wait()
         try:
             self.check_job_posting_is_loaded()
+            self.rate_controller.record_success()
+            if self.job_scraper.page_recorder:
+                self.job_scraper.page_recorder.record_fragments(self.driver)
         except (TooManyRequestsException, NoSuchElementException) as e:
             self.log(f"Attempt {attempt_number} to get job posting details failed")
+            if isinstance(e, TooManyRequestsException):
+                self.rate_controller.record_throttle()
             self.refresh_element_selection()
             # Now that we have refreshed our posting_element we can have the retry class start the function over
             raise e
 
+    def fetch_job_posting_details(self, job_details_future: Future = None) -> None:
+        self.log("Fetching the job posting details over HTTP")
+        self.job_scraper.request_counter += 1
+        try:
+            if job_details_future:
+                self.job_details = job_details_future.result()
+            else:
+                self.job_details = self.job_scraper.job_detail_fetcher.fetch(self.url)
+            # Pipeline fetches are reported here on the scraper thread so the controller only ever sees one thread
+            self.rate_controller.record_success()
+        except Exception as e:
+            if isinstance(e, TooManyRequestsException):
+                self.rate_controller.record_throttle()
+            self.log(f"Failed to fetch the job posting details over HTTP so we are falling back to the browser: {e}")
+            self.job_details = None
+            self.request_job_posting()
+
     def is_a_excluded_industry(self) -> bool:
         self.get_job_posting_industry()
-        if any(i for i in self.customizations['excluded_industries'] if i.lower().strip() in self.industry.lower()):
-            self.keywords.append("INDUSTRY")
-            self.rating = -999
+        exclusion_reason = self.exclusion_rules.get_industry_exclusion_reason(self.industry)
+        if exclusion_reason:
+            self.keywords.append(exclusion_reason)
+            self.rating = EXCLUDED_RATING
             self.log(f"Skipping as '{self.industry}' is in our exclusion list")
             return True
         return False
@@ -990,7 +1399,7 @@ class JobPosting:
     def refresh_element_selection(self) -> None:
         # We can sometimes go too fast and end up with a Too Many Requests exception
         # We can usually correct the situation by simply taking a pause and reloading the posting_element
-        sleep(random.uniform(minimum_jitter, maximum_jitter))
+        self.rate_controller.wait()
         all_job_postings_section = self.get_web_element(By.XPATH, self.app_config['job_results_list'])
         all_job_postings = all_job_postings_section.find_elements(By.TAG_NAME, "li")
         if self.element_index == 0:
@@ -1000,11 +1409,11 @@ class JobPosting:
         different_job_posting = all_job_postings[different_element_index]
         different_url_element = self.get_web_element(By.TAG_NAME, 'a', different_job_posting)
         different_url_element.click()
-        sleep(random.uniform(minimum_jitter, maximum_jitter))
+        self.rate_controller.wait()
 
     @retry(
         retry=retry_if_exception_type(StaleElementReferenceException),
-        wait=exponential_jitter_wait,
+        wait=wait_for_rate_controller,
         stop=max_retry_attempts,
         reraise=True
     )
@@ -1024,20 +1433,22 @@ class JobPosting:
             raise e
 
     def get_job_posting_keywords_and_rating(self) -> None:
-        # Iterate through the job content and see if there are any keywords we care about
-        job_content_lower = self.content.lower()
-        for keyword, rating in self.customizations['word_weights'].items():
-            if keyword.lower() in job_content_lower:
-                self.keywords.append(keyword)
-                self.rating += rating
+        # See if there are any keywords we care about in the job content
+        keywords, rating = self.keyword_rater.rate(self.content)
+        self.keywords.extend(keywords)
+        self.rating += rating
 
     def get_job_posting_content(self) -> str:
+        if self.job_details:
+            return self.job_details['content']
         job_posting_details = self.get_web_element(By.XPATH, self.app_config['job_posting_details_section'])
         job_posting_content_html = job_posting_details.get_attribute('innerHTML')
         job_posting_details_escaped = escape(job_posting_content_html)
         return str(job_posting_details_escaped)
 
     def get_job_posting_date(self) -> str:
+        if self.result_card and self.result_card['datetime']:
+            return self.result_card['datetime']
         job_posting_date_element = self.get_web_element(
             By.XPATH, self.app_config['job_posting_date'], self.posting_element
         )
@@ -1045,6 +1456,9 @@ class JobPosting:
         return job_posting_date
 
     def get_job_posting_industry(self) -> None:
+        if self.job_details:
+            self.industry = self.job_details['industry']
+            return
         job_posting_industry_section = self.driver.find_elements(By.XPATH, self.app_config['job_posting_industry'])
         if not job_posting_industry_section:
             raise ElementNotFoundException("Could not find the job industry section")
@@ -1063,7 +1477,8 @@ if __name__ == '__main__':
         scraper = TheJobScraper()
         start_time = time.time()
         scraper.scrape_jobs_from_linkedin()
-        scraper.driver.quit()
+        if scraper.driver:
+            scraper.driver.quit()
         elapsed_time = time.gmtime(int(time.time()) - int(start_time))
         formatted_runtime = time.strftime("%H:%M:%S", elapsed_time)
         logging.info(f"Execution finished normally with a runtime of {formatted_runtime} and a total of {scraper.request_counter} requests")
@@ -1086,3 +1501,23 @@ if __name__ == '__main__':
             scraper.driver.quit()
         except Exception:
             pass
+        try:
+            scraper.job_store.close()
+        except Exception:
+            pass
+        # The scraper may have failed before it got as far as building these
+        if getattr(scraper, "page_recorder", None):
+            try:
+                scraper.page_recorder.save()
+            except Exception:
+                pass
+        if getattr(scraper, "detail_fetch_pipeline", None):
+            try:
+                scraper.detail_fetch_pipeline.close()
+            except Exception:
+                pass
+        if getattr(scraper, "job_detail_fetcher", None):
+            try:
+                scraper.job_detail_fetcher.close()
+            except Exception:
+                pass
@@ -0,0 +1,206 @@
+"""Spreads the (search, location) units of a run across several independent Chrome workers.
+
+Every worker is its own process with its own TheJobScraper and browser. The workers share one
+job id index for duplicate detection and send every posting, checkpoint update, rate controller
+event, page load observation and their request count back to the parent process, which stays the
+only writer of the journal, checkpoint, rate controller state, page load profiles and job store.
+"""
+import logging
+import multiprocessing
+import queue
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# How long the parent waits on the result queue before checking that the workers are still alive
+RESULT_QUEUE_TIMEOUT = 60
+
+
+class SharedJobIndex:
+    """Set-like view over a manager dict so that every worker sees the job ids the others found."""
+
+    def __init__(self, shared_dict):
+        self.shared_dict = shared_dict
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.shared_dict
+
+    def __len__(self) -> int:
+        return len(self.shared_dict)
+
+    def add(self, job_id: str) -> None:
+        self.shared_dict[job_id] = True
+
+    def discard(self, job_id: str) -> None:
+        self.shared_dict.pop(job_id, None)
+
+
+class BrowserWorker:
+    """Stands in for the scrape journal and checkpoint inside a worker and forwards everything to the parent."""
+
+    def __init__(self, worker_id: int, result_queue, shared_job_ids: SharedJobIndex, completed_units: set, unit_offsets: dict, deadline_at: float):
+        self.worker_id = worker_id
+        # Every worker works towards the deadline of the run that started it
+        self.deadline_at = deadline_at
+        self.result_queue = result_queue
+        self.shared_job_ids = shared_job_ids
+        self.completed_units = completed_units
+        self.unit_offsets = unit_offsets
+
+    def send(self, message_type: str, payload) -> None:
+        self.result_queue.put((message_type, self.worker_id, payload))
+
+    # Scrape journal interface
+    def append(self, job_posting_json: dict) -> None:
+        self.send("job", job_posting_json)
+
+    # Scrape checkpoint interface
+    def is_unit_completed(self, search: str, location: str, timespan: str) -> bool:
+        return (search, location, timespan) in self.completed_units
+
+    def get_offset(self, search: str, location: str, timespan: str) -> int:
+        return self.unit_offsets.get((search, location, timespan), 0)
+
+    def update_offset(self, search: str, location: str, timespan: str, offset: int) -> None:
+        self.unit_offsets[(search, location, timespan)] = offset
+        self.send("offset", (search, location, timespan, offset))
+
+    def complete_unit(self, search: str, location: str, timespan: str) -> None:
+        self.completed_units.add((search, location, timespan))
+        self.send("unit", (search, location, timespan))
+
+    # Search planner interface
+    def record_scraped(self, search: str, location: str, scraped_at: str) -> None:
+        self.send("scraped", (search, location, scraped_at))
+
+    def record_run(self, search: str, location: str, run_stats: dict) -> None:
+        self.send("run", (search, location, run_stats))
+
+    # Rate controller events, the parent's controller is the only one that saves the learned rate
+    def record_rate_event(self, event: str) -> None:
+        self.send("rate", event)
+
+    # Page load profile observations, merged into the parent's profiles which are the only ones saved
+    def record_page_load_profiles(self, changes: dict) -> None:
+        self.send("profiles", changes)
+
+
+def run_browser_worker(worker_id: int, work_queue, result_queue, shared_job_ids: SharedJobIndex, completed_units: set, unit_offsets: dict, deadline_at: float) -> None:
+    # Imported here as the job scraper module is the one that starts the pool
+    from job_scraper import TheJobScraper
+
+    browser_worker = BrowserWorker(worker_id, result_queue, shared_job_ids, completed_units, unit_offsets, deadline_at)
+    scraper = None
+    try:
+        scraper = TheJobScraper(browser_worker)
+        while True:
+            try:
+                search, location = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if scraper.run_deadline.is_run_expired():
+                scraper.log(f"Skipping '{search}' in '{location}' as the run is out of time")
+                continue
+            scraper.scrape_search_location(search, location)
+    except Exception:
+        logging.exception(f"Browser worker {worker_id} ran into an unrecoverable error")
+    finally:
+        request_counter = 0
+        if scraper:
+            request_counter = scraper.request_counter
+            if scraper.resource_policy:
+                scraper.log(scraper.resource_policy.get_summary())
+            try:
+                scraper.driver.quit()
+            except Exception:
+                pass
+            # Sent before we report done as the parent stops listening to us after that
+            try:
+                scraper.page_load_profiles.save()
+            except Exception:
+                pass
+            if scraper.page_recorder:
+                try:
+                    scraper.page_recorder.save()
+                except Exception:
+                    pass
+            if scraper.detail_fetch_pipeline:
+                try:
+                    scraper.detail_fetch_pipeline.close()
+                except Exception:
+                    pass
+            if scraper.job_detail_fetcher:
+                try:
+                    scraper.job_detail_fetcher.close()
+                except Exception:
+                    pass
+        browser_worker.send("done", request_counter)
+
+
+class BrowserWorkerPool:
+
+    def __init__(self, job_scraper, worker_count: int):
+        self.job_scraper = job_scraper
+        self.worker_count = worker_count
+        # Chrome and forked processes do not get along so every worker starts from a clean interpreter
+        self.context = multiprocessing.get_context("spawn")
+
+    def run(self, units: list[tuple[str, str]]) -> None:
+        checkpoint = self.job_scraper.scrape_checkpoint
+        with self.context.Manager() as manager:
+            shared_job_ids = SharedJobIndex(manager.dict(dict.fromkeys(self.job_scraper.scraped_job_ids, True)))
+            work_queue = self.context.Queue()
+            result_queue = self.context.Queue()
+            for unit in units:
+                work_queue.put(unit)
+            worker_count = min(self.worker_count, len(units))
+            workers = []
+            for worker_id in range(worker_count):
+                worker = self.context.Process(
+                    target=run_browser_worker,
+                    args=(
+                        worker_id, work_queue, result_queue, shared_job_ids,
+                        set(checkpoint.completed_units), dict(checkpoint.unit_offsets), self.job_scraper.run_deadline.ends_at
+                    ),
+                    daemon=False
+                )
+                worker.start()
+                workers.append(worker)
+            self.job_scraper.log(f"Started {worker_count} browser workers for {len(units)} search and location units")
+            self.collect_results(result_queue, workers)
+            for worker in workers:
+                worker.join()
+
+    def collect_results(self, result_queue, workers: list) -> None:
+        checkpoint = self.job_scraper.scrape_checkpoint
+        finished_workers = 0
+        while finished_workers < len(workers):
+            try:
+                message_type, worker_id, payload = result_queue.get(timeout=RESULT_QUEUE_TIMEOUT)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    self.job_scraper.log("Every browser worker has exited without reporting back")
+                    return
+                continue
+            match message_type:
+                case "job":
+                    self.job_scraper.add_new_job_scrape(payload)
+                case "offset":
+                    checkpoint.update_offset(*payload)
+                case "unit":
+                    checkpoint.complete_unit(*payload)
+                case "scraped":
+                    self.job_scraper.search_planner.record_scraped(*payload)
+                case "run":
+                    self.job_scraper.search_planner.record_run(*payload)
+                case "profiles":
+                    self.job_scraper.page_load_profiles.merge_changes(payload)
+                case "rate":
+                    if payload == "throttle":
+                        self.job_scraper.rate_controller.record_throttle()
+                    else:
+                        self.job_scraper.rate_controller.record_success()
+                case "done":
+                    finished_workers += 1
+                    self.job_scraper.request_counter += payload
+                    self.job_scraper.log(f"Browser worker {worker_id} has finished with {payload} requests")
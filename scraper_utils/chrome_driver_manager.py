@@ -0,0 +1,88 @@
+"""Keeps a warm Chrome browser around across (search, location, timespan) units.
+
+Launching a browser means loading the extension, picking a user agent and starting Chrome, which
+adds up to minutes over a run. Instead the same browser is reused between units with its cookies
+and storage wiped, and is only replaced when it fails a health check or after it has served the
+configured number of units.
+"""
+import logging
+import random
+from time import sleep
+from typing import Callable
+
+from undetected_chromedriver import Chrome
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+HEALTH_CHECK_SCRIPT = "return 1;"
+
+
+class ChromeDriverManager:
+
+    def __init__(self, driver_factory: Callable[[], Chrome], max_units_per_driver: int, minimum_jitter: float, maximum_jitter: float):
+        self.driver_factory = driver_factory
+        self.max_units_per_driver = max_units_per_driver
+        self.minimum_jitter = minimum_jitter
+        self.maximum_jitter = maximum_jitter
+        self.driver = None
+        self.units_served = 0
+        self.drivers_started = 0
+
+    def get_driver_for_new_unit(self) -> Chrome:
+        if not self.driver:
+            _log.info("There is no browser running yet so we are starting one")
+            return self.restart()
+        if self.units_served >= self.max_units_per_driver:
+            _log.info(f"The browser has served {self.units_served} units so we are replacing it")
+            return self.restart()
+        if not self.is_healthy():
+            _log.info("The browser failed its health check so we are replacing it")
+            return self.restart()
+        try:
+            self.reset_browser_state()
+        except Exception as e:
+            _log.info(f"Failed to reset the browser state so we are replacing it: {e}")
+            return self.restart()
+        self.units_served += 1
+        _log.info(f"Reusing the warm browser for unit {self.units_served} of {self.max_units_per_driver}")
+        return self.driver
+
+    def restart(self) -> Chrome:
+        if self.driver:
+            self.quit()
+            sleep(random.uniform(self.minimum_jitter, self.maximum_jitter))
+        self.driver = self.driver_factory()
+        self.drivers_started += 1
+        self.units_served = 1
+        return self.driver
+
+    def is_healthy(self) -> bool:
+        try:
+            _ = self.driver.current_url
+            return self.driver.execute_script(HEALTH_CHECK_SCRIPT) == 1
+        except Exception:
+            return False
+
+    def reset_browser_state(self) -> None:
+        # Storage can only be cleared for the origin we are on so this has to happen before leaving the page
+        try:
+            self.driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        except Exception:
+            pass
+        try:
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        except Exception:
+            self.driver.delete_all_cookies()
+        self.driver.get("about:blank")
+
+    def quit(self) -> None:
+        if not self.driver:
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            _log.info(f"Failed to cleanly quit the browser: {e}")
+        self.driver = None
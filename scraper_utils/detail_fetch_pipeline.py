@@ -0,0 +1,135 @@
+"""Asyncio stage that fetches job posting details in the background while the results are scrolled.
+
+Job URLs are submitted from the scraper thread as the result list produces them and are fetched
+with JobDetailFetcher on an event loop running in its own thread. Concurrency is bounded by a
+semaphore and every host gets a token bucket so that we never go over the configured request rate.
+Each submission returns a concurrent.futures.Future that resolves to the parsed job details.
+
+Run it directly to benchmark the pipeline against the local fixture server:
+
+    python -m scraper_utils.detail_fetch_pipeline [job count] [response delay in seconds]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+from scraper_utils.fixture_server import FixtureServer
+from scraper_utils.job_detail_fetcher import JobDetailFetcher
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+
+class TokenBucket:
+
+    def __init__(self, requests_per_second: float, burst: int):
+        self.requests_per_second = requests_per_second
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.requests_per_second)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            self.refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.requests_per_second)
+                self.refill()
+            self.tokens -= 1
+
+
+class DetailFetchPipeline:
+
+    def __init__(self, job_detail_fetcher: JobDetailFetcher, max_concurrency: int, requests_per_second: float, burst: int):
+        self.job_detail_fetcher = job_detail_fetcher
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.token_buckets = {}
+        self.semaphore = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.run_loop, daemon=True)
+
+    def run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self) -> "DetailFetchPipeline":
+        self.thread.start()
+        return self
+
+    def submit(self, job_url: str) -> Future:
+        return asyncio.run_coroutine_threadsafe(self.fetch(job_url), self.loop)
+
+    def get_token_bucket(self, host: str) -> TokenBucket:
+        if host not in self.token_buckets:
+            self.token_buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        return self.token_buckets[host]
+
+    async def fetch(self, job_url: str) -> dict:
+        # Everything here runs on the event loop thread so there is no race on creating these lazily
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        detail_url = self.job_detail_fetcher.get_detail_url(job_url)
+        token_bucket = self.get_token_bucket(urlparse(detail_url).netloc)
+        async with self.semaphore:
+            await token_bucket.acquire()
+            # The pooled requests session does the blocking IO on a worker thread
+            return await asyncio.to_thread(self.job_detail_fetcher.fetch, job_url)
+
+    def close(self) -> None:
+        if not self.thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+BENCHMARK_JOB_PAGE = """<html><body>
+<a class="topcard__org-name-link">Benchmark Company</a>
+<ul><li class="description__job-criteria-item"><h3>Industries</h3><span>Software Development</span></li></ul>
+<div class="description__text"><section><div><p>We are looking for an engineer who knows terraform and kubernetes.</p></div></section></div>
+</body></html>"""
+
+
+def main():
+    job_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    response_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    fixture_directory = tempfile.mkdtemp()
+    default_fixture = os.path.join(fixture_directory, "job_posting.html")
+    with open(default_fixture, "w") as f:
+        f.write(BENCHMARK_JOB_PAGE)
+    job_urls = [f"https://www.linkedin.com/jobs/view/benchmark-job-{job_id}" for job_id in range(1, job_count + 1)]
+    with FixtureServer(fixture_directory, default_fixture=default_fixture, response_delay=response_delay) as server:
+        url_template = server.base_url + "/jobs-guest/jobs/api/jobPosting/{job_id}"
+        job_detail_fetcher = JobDetailFetcher(url_template, "benchmark", 15, 8)
+        start_time = time.perf_counter()
+        for job_url in job_urls:
+            job_detail_fetcher.fetch(job_url)
+        sequential_duration = time.perf_counter() - start_time
+        pipeline = DetailFetchPipeline(job_detail_fetcher, 8, 1000, 8).start()
+        start_time = time.perf_counter()
+        futures = [pipeline.submit(job_url) for job_url in job_urls]
+        for future in futures:
+            future.result()
+        pipeline_duration = time.perf_counter() - start_time
+        pipeline.close()
+        job_detail_fetcher.close()
+    print(f"Fetched {job_count} job postings with a {response_delay}s response delay")
+    print(f"Sequential: {sequential_duration:.3f}s ({job_count / sequential_duration:.1f} jobs/s)")
+    print(f"Pipeline:   {pipeline_duration:.3f}s ({job_count / pipeline_duration:.1f} jobs/s)")
+
+
+if __name__ == '__main__':
+    main()
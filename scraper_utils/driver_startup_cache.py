@@ -0,0 +1,122 @@
+"""Caches the expensive parts of starting a browser so a restart only pays for launching Chrome.
+
+Left to itself undetected_chromedriver throws its driver away and downloads and patches a fresh one
+for every browser it starts. Instead we keep one patched chromedriver per Chrome major version in a
+cache directory and hand that to every launch, and only build it again once Chrome gets updated.
+The configured chromedriver is used as the source when it matches the installed Chrome and a matching
+one is downloaded otherwise.
+
+Building the fake_useragent pool loads its whole data set, so that is done once per process as well.
+
+Run it directly to compare a cold start against a warm one:
+
+    python -m scraper_utils.driver_startup_cache [configured chromedriver path]
+"""
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from functools import cache
+
+import undetected_chromedriver as uc
+from fake_useragent import UserAgent
+from undetected_chromedriver.patcher import Patcher
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+MAJOR_VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+")
+
+
+def get_major_version(executable_path: str) -> int:
+    try:
+        output = subprocess.check_output([executable_path, "--version"], stderr=subprocess.DEVNULL, timeout=30).decode("utf-8")
+    except (OSError, subprocess.SubprocessError) as e:
+        _log.info(f"Failed to get the version of '{executable_path}': {e}")
+        return None
+    version_match = MAJOR_VERSION_PATTERN.search(output)
+    return int(version_match.group(1)) if version_match else None
+
+
+@cache
+def get_user_agent_pool() -> UserAgent:
+    # Mobile and tablet user agents get served a different LinkedIn layout
+    agents = UserAgent()
+    platforms_choices = [item for item in agents.platforms if item != "mobile" and item != "tablet"]
+    os_choices = [item for item in agents.os if item != "android" and item != "ios"]
+    return UserAgent(os=os_choices, platforms=platforms_choices)
+
+
+def get_random_user_agent() -> str:
+    return get_user_agent_pool().random
+
+
+class DriverStartupCache:
+
+    def __init__(self, cache_directory: str, chrome_driver_executable_path: str = None):
+        self.cache_directory = cache_directory
+        self.chrome_driver_executable_path = chrome_driver_executable_path
+        self.patched_chromedriver_path = None
+
+    def get_patched_chromedriver(self) -> str:
+        """Returns the cached patched chromedriver for the installed Chrome, or None to let undetected_chromedriver handle it."""
+        if self.patched_chromedriver_path:
+            return self.patched_chromedriver_path
+        chrome_executable_path = uc.find_chrome_executable()
+        chrome_version = get_major_version(chrome_executable_path) if chrome_executable_path else None
+        if not chrome_version:
+            _log.info("Could not work out the Chrome version so the chromedriver will not be cached")
+            return None
+        cached_path = os.path.join(self.cache_directory, f"chromedriver_{chrome_version}")
+        if not Patcher(executable_path=cached_path).is_binary_patched():
+            _log.info(f"There is no patched chromedriver cached for Chrome {chrome_version} yet so we are building one")
+            self.build_patched_chromedriver(chrome_version, cached_path)
+        self.patched_chromedriver_path = cached_path
+        return cached_path
+
+    def build_patched_chromedriver(self, chrome_version: int, cached_path: str) -> None:
+        os.makedirs(self.cache_directory, exist_ok=True)
+        # Every worker process may be building this at the same time so each one works on its own copy
+        temporary_path = f"{cached_path}.{os.getpid()}.tmp"
+        configured_path = self.chrome_driver_executable_path
+        if configured_path and os.path.isfile(configured_path) and get_major_version(configured_path) == chrome_version:
+            shutil.copy2(configured_path, temporary_path)
+        else:
+            _log.info(f"Downloading a chromedriver for Chrome {chrome_version}")
+            downloader = Patcher(version_main=chrome_version)
+            downloader.auto()
+            shutil.copy2(downloader.executable_path, temporary_path)
+        Patcher(executable_path=temporary_path).auto()
+        os.chmod(temporary_path, 0o755)
+        os.replace(temporary_path, cached_path)
+
+
+def start_benchmark_browser(driver_startup_cache: DriverStartupCache) -> float:
+    start_time = time.perf_counter()
+    options = uc.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument(f"--user-agent={get_random_user_agent()}")
+    driver = uc.Chrome(options=options, driver_executable_path=driver_startup_cache.get_patched_chromedriver())
+    start_duration = time.perf_counter() - start_time
+    driver.quit()
+    return start_duration
+
+
+def main():
+    chrome_driver_executable_path = sys.argv[1] if len(sys.argv) > 1 else None
+    driver_startup_cache = DriverStartupCache(tempfile.mkdtemp(), chrome_driver_executable_path)
+    cold_duration = start_benchmark_browser(driver_startup_cache)
+    # A new cache object over the same directory is what a fresh run sees, the second start is the warm browser restart
+    warm_run_duration = start_benchmark_browser(DriverStartupCache(driver_startup_cache.cache_directory, chrome_driver_executable_path))
+    warm_restart_duration = start_benchmark_browser(driver_startup_cache)
+    print(f"Cold start with an empty cache:   {cold_duration:.3f}s")
+    print(f"Warm start in a new run:          {warm_run_duration:.3f}s")
+    print(f"Warm restart in the same process: {warm_restart_duration:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+class UnexpectedBehaviorException(Exception):
+    pass
+
+
+class RedirectedException(Exception):
+    pass
+
+
+class TooManyRequestsException(Exception):
+    pass
+
+
+class ElementNotFoundException(Exception):
+    pass
+
+
+class DeadlineExceededException(Exception):
+    pass
@@ -0,0 +1,134 @@
+"""Exclusion lists from the customizations compiled into one case-insensitive pattern per field.
+
+A job is excluded when its title, company, location or industry contains any of the entries in the
+matching excluded_* list. Every list is compiled once into a single alternation so that checking a
+field is one regex search, instead of lowercasing and stripping every entry for every card. A check
+returns the reason code of the field that matched, which is also the keyword excluded jobs get
+tagged with, or None when the job is not excluded.
+
+Run it directly to re-apply the current exclusion lists to the whole job history:
+
+    python -m scraper_utils.exclusion_rules [--apply]
+"""
+import argparse
+import logging
+import os
+import re
+import time
+
+import yaml
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+TITLE = "TITLE"
+COMPANY = "COMPANY"
+LOCATION = "LOCATION"
+INDUSTRY = "INDUSTRY"
+
+# The fields of a job that every reason code is checked against, in the order they are checked
+REASON_FIELDS = {
+    TITLE: "title",
+    COMPANY: "company",
+    LOCATION: "location",
+    INDUSTRY: "industry",
+}
+EXCLUDED_RATING = -999
+
+
+def compile_exclusion_pattern(excluded_entries: list[str]) -> re.Pattern:
+    excluded_entries = [entry.strip() for entry in excluded_entries or [] if entry and entry.strip()]
+    if not excluded_entries:
+        return None
+    # Longest first so the reported match is the most specific entry
+    excluded_entries.sort(key=len, reverse=True)
+    return re.compile("|".join(re.escape(entry) for entry in excluded_entries), re.IGNORECASE)
+
+
+class ExclusionRules:
+
+    def __init__(self, excluded_title_keywords: list[str], excluded_companies: list[str], excluded_locations: list[str], excluded_industries: list[str]):
+        self.patterns = {
+            TITLE: compile_exclusion_pattern(excluded_title_keywords),
+            COMPANY: compile_exclusion_pattern(excluded_companies),
+            LOCATION: compile_exclusion_pattern(excluded_locations),
+            INDUSTRY: compile_exclusion_pattern(excluded_industries),
+        }
+
+    @classmethod
+    def from_customizations(cls, customizations: dict) -> "ExclusionRules":
+        return cls(
+            customizations['excluded_title_keywords'],
+            customizations['excluded_companies'],
+            customizations['excluded_locations'],
+            customizations['excluded_industries'],
+        )
+
+    def get_match(self, reason: str, value: str) -> str:
+        """Returns the text that matched one of the exclusion entries for the field of the reason, or None."""
+        pattern = self.patterns[reason]
+        if not pattern or not value:
+            return None
+        match = pattern.search(value)
+        return match.group(0) if match else None
+
+    def get_exclusion_reason(self, title: str, company: str, location: str) -> str:
+        for reason, value in ((TITLE, title), (COMPANY, company), (LOCATION, location)):
+            if self.get_match(reason, value):
+                return reason
+        return None
+
+    def get_industry_exclusion_reason(self, industry: str) -> str:
+        return INDUSTRY if self.get_match(INDUSTRY, industry) else None
+
+    def evaluate(self, job: dict) -> str:
+        for reason, field in REASON_FIELDS.items():
+            if self.get_match(reason, job.get(field)):
+                return reason
+        return None
+
+    def evaluate_batch(self, jobs: list[dict]) -> list[str]:
+        return [self.evaluate(job) for job in jobs]
+
+
+def main():
+    # Imported here as only re-applying the rules to the history needs the job store
+    from scraper_utils.job_store import JobStore
+
+    parser = argparse.ArgumentParser(description="Re-applies the exclusion lists to every job in the job store")
+    parser.add_argument("--apply", action="store_true", help="Write the newly excluded jobs back to the job store")
+    arguments = parser.parse_args()
+
+    repository_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(repository_directory, "config.yaml"), "r") as f:
+        app_config = yaml.load(f, Loader=yaml.FullLoader)
+    with open(os.path.join(repository_directory, "customizations.yaml"), "r") as f:
+        customizations = yaml.load(f, Loader=yaml.FullLoader)
+    exclusion_rules = ExclusionRules.from_customizations(customizations)
+
+    with JobStore(os.path.join(repository_directory, app_config['jobs_database_filepath'])) as job_store:
+        all_jobs = job_store.get_all_jobs()
+        start_time = time.perf_counter()
+        reasons = exclusion_rules.evaluate_batch(all_jobs)
+        duration = time.perf_counter() - start_time
+        newly_excluded_jobs = []
+        reason_counts = {reason: 0 for reason in REASON_FIELDS}
+        for job, reason in zip(all_jobs, reasons):
+            if not reason:
+                continue
+            reason_counts[reason] += 1
+            if job['rating'] != EXCLUDED_RATING:
+                job['rating'] = EXCLUDED_RATING
+                job['keywords'] = reason
+                newly_excluded_jobs.append(job)
+        print(f"Checked {len(all_jobs)} jobs against the exclusion lists in {duration:.3f}s")
+        for reason, count in reason_counts.items():
+            print(f"{reason:<10} {count}")
+        print(f"{len(newly_excluded_jobs)} jobs are excluded now that were not before")
+        if arguments.apply and newly_excluded_jobs:
+            job_store.update_ratings(newly_excluded_jobs)
+            print("Saved the newly excluded jobs to the job store")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Local HTTP server that serves recorded pages so the scraper can be exercised without LinkedIn.
+
+Recorded pages live in a fixture directory and are looked up by the request path. A request for
+'/jobs-guest/jobs/api/jobPosting/3812345678' is answered with the first of these that exists:
+
+    <fixture directory>/jobs-guest/jobs/api/jobPosting/3812345678.html
+    <fixture directory>/jobs-guest/jobs/api/jobPosting/3812345678
+    <fixture directory>/3812345678.html
+
+A default fixture can be given which answers every request that has no recorded page, and a
+response delay can be set to stand in for the network latency of the real site.
+
+Run it directly to serve a directory by hand:
+
+    python -m scraper_utils.fixture_server <fixture directory> [port]
+"""
+import logging
+import mimetypes
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def find_fixture(self) -> str:
+        fixture_directory = self.server.fixture_directory
+        request_path = urlparse(self.path).path.strip("/")
+        candidates = [
+            os.path.join(fixture_directory, request_path + ".html"),
+            os.path.join(fixture_directory, request_path),
+            os.path.join(fixture_directory, os.path.basename(request_path) + ".html"),
+        ]
+        for candidate in candidates:
+            candidate = os.path.abspath(candidate)
+            # Never serve anything from outside of the fixture directory
+            if not candidate.startswith(os.path.abspath(fixture_directory)):
+                continue
+            if os.path.isfile(candidate):
+                return candidate
+        return self.server.default_fixture
+
+    def do_GET(self):
+        self.server.requests_served += 1
+        if self.server.response_delay:
+            time.sleep(self.server.response_delay)
+        fixture_path = self.find_fixture()
+        if not fixture_path:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        with open(fixture_path, "rb") as f:
+            body = self.transform_body(fixture_path, f.read())
+        content_type, _ = mimetypes.guess_type(fixture_path)
+        if not content_type or content_type == "text/html":
+            content_type = "text/html; charset=utf-8"
+        self.send_response(self.server.status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.bytes_served += len(body)
+
+    def transform_body(self, fixture_path: str, body: bytes) -> bytes:
+        return body
+
+    def log_message(self, format, *args):
+        _log.debug(format, *args)
+
+
+class FixtureServer:
+    """Serves a fixture directory on localhost from a background thread, usable as a context manager."""
+
+    request_handler_class = FixtureRequestHandler
+
+    def __init__(self, fixture_directory: str, port: int = 0, status_code: int = 200, default_fixture: str = None, response_delay: float = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self.request_handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.fixture_directory = fixture_directory
+        self.httpd.status_code = status_code
+        self.httpd.requests_served = 0
+        self.httpd.bytes_served = 0
+        self.httpd.default_fixture = default_fixture
+        self.httpd.response_delay = response_delay
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests_served(self) -> int:
+        return self.httpd.requests_served
+
+    @property
+    def bytes_served(self) -> int:
+        return self.httpd.bytes_served
+
+    def start(self) -> "FixtureServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    fixture_directory = sys.argv[1]
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    server = FixtureServer(fixture_directory, port)
+    print(f"Serving '{fixture_directory}' on {server.base_url}")
+    server.start()
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
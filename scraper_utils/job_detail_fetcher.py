@@ -0,0 +1,96 @@
+"""Fetches job posting details over plain HTTP instead of clicking each card in the browser.
+
+The public job view HTML is requested over one pooled keep-alive session and the industry and
+description are parsed out of it, which skips the click, the sleep and the wait for the right hand
+pane of the search results. The URL template is configurable so that the fetcher can be pointed at
+the local fixture server in scraper_utils/fixture_server.py.
+"""
+import logging
+import re
+from html import escape
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from scraper_utils.exceptions import ElementNotFoundException, TooManyRequestsException
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+TOO_MANY_REQUESTS_MARKERS = (
+    "http error 429",
+    "your linkedin network will be back soon",
+)
+
+
+def get_numeric_job_id(job_url: str) -> str:
+    # Job view URLs end in '<title>-at-<company>-<numeric id>' and the guest API only wants the number
+    match = re.search(r"(\d+)/?$", job_url)
+    if not match:
+        return None
+    return match.group(1)
+
+
+def is_too_many_requests(status_code: int, html: str) -> bool:
+    if status_code == 429:
+        return True
+    html_lower = html.lower()
+    return any(marker in html_lower for marker in TOO_MANY_REQUESTS_MARKERS)
+
+
+def parse_job_details(html: str) -> dict:
+    soup = BeautifulSoup(html, "html.parser")
+    company = soup.select_one(".topcard__org-name-link, span.topcard__flavor")
+    if not company or not company.get_text(strip=True):
+        # Same as the browser path, a blank company name means the page did not really load
+        raise TooManyRequestsException("Could not find the job posting company name")
+    industry = ""
+    for criteria_item in soup.select("li.description__job-criteria-item"):
+        criteria_title = criteria_item.find("h3")
+        criteria_value = criteria_item.find("span")
+        if criteria_title and criteria_value and criteria_title.get_text(strip=True) == "Industries":
+            industry = criteria_value.get_text(strip=True)
+    description = soup.select_one("div.description__text section div") or soup.select_one("div.show-more-less-html__markup")
+    if not description:
+        raise ElementNotFoundException("Could not find the job posting description")
+    return {
+        "company": company.get_text(strip=True),
+        "industry": industry,
+        "content": str(escape(description.decode_contents())),
+    }
+
+
+class JobDetailFetcher:
+
+    def __init__(self, url_template: str, user_agent: str, timeout: float, pool_size: int):
+        self.url_template = url_template
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        self.requests_made = 0
+
+    def get_detail_url(self, job_url: str) -> str:
+        numeric_job_id = get_numeric_job_id(job_url)
+        if not numeric_job_id:
+            raise ElementNotFoundException(f"Could not find a job id in '{job_url}'")
+        return self.url_template.format(job_id=numeric_job_id)
+
+    def fetch(self, job_url: str) -> dict:
+        detail_url = self.get_detail_url(job_url)
+        self.requests_made += 1
+        response = self.session.get(detail_url, timeout=self.timeout)
+        if is_too_many_requests(response.status_code, response.text):
+            raise TooManyRequestsException(f"We have been hit with HTTP 429 while fetching '{detail_url}'")
+        response.raise_for_status()
+        return parse_job_details(response.text)
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,237 @@
+"""SQLite backed storage for every job posting we have ever scraped.
+
+Postings are keyed by their LinkedIn job id so that a run only has to upsert the postings
+it found (or re-rated) instead of rewriting the entire job history to disk.
+
+Every rated posting also remembers the fingerprint of the word_weights it was rated with, a hash of
+the content it was rated on and which keywords were found in that content, so a run only has to
+re-rate the postings whose rating has gone stale.
+"""
+import json
+import logging
+import os
+import sqlite3
+from datetime import date
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+JOB_COLUMNS = (
+    "Applied",
+    "posted_time",
+    "title",
+    "company",
+    "industry",
+    "location",
+    "rating",
+    "keywords",
+    "search",
+    "url",
+    "content",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    Applied INTEGER NOT NULL DEFAULT 0,
+    posted_time TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    industry TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    rating INTEGER NOT NULL DEFAULT 0,
+    keywords TEXT NOT NULL DEFAULT '',
+    search TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL DEFAULT '',
+    weights_fingerprint TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS jobs_rating_index ON jobs (rating DESC);
+CREATE INDEX IF NOT EXISTS jobs_posted_time_index ON jobs (posted_time);
+CREATE INDEX IF NOT EXISTS jobs_search_index ON jobs (search);
+CREATE TABLE IF NOT EXISTS keyword_hits (
+    job_id TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (job_id, keyword)
+);
+CREATE TABLE IF NOT EXISTS word_weights_versions (
+    fingerprint TEXT PRIMARY KEY,
+    word_weights TEXT NOT NULL
+);
+"""
+
+# Added after the jobs table was first released so older databases get them on open
+RATING_STATE_COLUMNS = {
+    "weights_fingerprint": "TEXT NOT NULL DEFAULT ''",
+    "content_hash": "TEXT NOT NULL DEFAULT ''",
+}
+
+
+def get_job_id_from_url(url: str) -> str:
+    if not url:
+        return None
+    split_job_url = url.split("/view/")
+    if len(split_job_url) != 2:
+        return None
+    return split_job_url[1].lower()
+
+
+class JobStore:
+    """Thin wrapper around the jobs database that speaks the same dicts as JobPosting.get_job_posting_json_data."""
+
+    def __init__(self, database_path: str):
+        self.database_path = database_path
+        self.connection = sqlite3.connect(database_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.add_missing_columns()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_missing_columns(self) -> None:
+        existing_columns = {row['name'] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+        with self.connection:
+            for column, definition in RATING_STATE_COLUMNS.items():
+                if column not in existing_columns:
+                    self.connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+
+    def is_empty(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is None
+
+    def import_json(self, json_path: str) -> int:
+        # One time migration of the legacy all_jobs.json file into the database
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, "r") as f:
+            job_postings = json.load(f) or []
+        imported = self.upsert_jobs(job_postings)
+        _log.info(f"Imported {imported} job postings from '{json_path}'")
+        return imported
+
+    def upsert_jobs(self, job_postings: list[dict]) -> int:
+        rows = [row for row in (self.job_to_row(job) for job in job_postings) if row]
+        columns = ", ".join(JOB_COLUMNS)
+        placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+        updates = ", ".join(f"{column}=excluded.{column}" for column in JOB_COLUMNS if column != "Applied")
+        # The rating and content that were just written may not be what the job was last rated with
+        updates += ", weights_fingerprint=''"
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO jobs (job_id, {columns}) VALUES (?, {placeholders}) "
+                f"ON CONFLICT(job_id) DO UPDATE SET {updates}",
+                rows
+            )
+        return len(rows)
+
+    def insert_missing_jobs(self, job_postings: list[dict]) -> int:
+        """Adds the jobs the store does not have yet and leaves the ones it already has alone."""
+        rows = [row for row in (self.job_to_row(job) for job in job_postings) if row]
+        columns = ", ".join(JOB_COLUMNS)
+        placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+        with self.connection:
+            inserted = self.connection.total_changes
+            self.connection.executemany(
+                f"INSERT INTO jobs (job_id, {columns}) VALUES (?, {placeholders}) ON CONFLICT(job_id) DO NOTHING",
+                rows
+            )
+            return self.connection.total_changes - inserted
+
+    def update_ratings(self, job_postings: list[dict]) -> int:
+        rows = []
+        for job in job_postings:
+            job_id = get_job_id_from_url(job['url'])
+            if not job_id:
+                continue
+            rows.append((job['rating'], self.normalize_keywords(job['keywords']), job_id))
+        with self.connection:
+            self.connection.executemany("UPDATE jobs SET rating=?, keywords=? WHERE job_id=?", rows)
+        return len(rows)
+
+    def get_rating_states(self) -> dict[str, tuple[str, str]]:
+        """Returns the weights fingerprint and content hash every job was last rated with, keyed by job id."""
+        cursor = self.connection.execute("SELECT job_id, weights_fingerprint, content_hash FROM jobs")
+        return {row['job_id']: (row['weights_fingerprint'], row['content_hash']) for row in cursor}
+
+    def get_keyword_hits(self, job_ids: set[str]) -> dict[str, set[str]]:
+        keyword_hits = {job_id: set() for job_id in job_ids}
+        for row in self.connection.execute("SELECT job_id, keyword FROM keyword_hits"):
+            if row['job_id'] in keyword_hits:
+                keyword_hits[row['job_id']].add(row['keyword'])
+        return keyword_hits
+
+    def save_rating_states(self, weights_fingerprint: str, rating_states: list[tuple[str, str, set[str]]]) -> int:
+        """Records the (job id, content hash, lowercased keywords found) each job was just rated with."""
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE jobs SET weights_fingerprint=?, content_hash=? WHERE job_id=?",
+                [(weights_fingerprint, content_hash, job_id) for job_id, content_hash, _ in rating_states]
+            )
+            self.connection.executemany("DELETE FROM keyword_hits WHERE job_id=?", [(job_id,) for job_id, _, _ in rating_states])
+            self.connection.executemany(
+                "INSERT INTO keyword_hits (job_id, keyword) VALUES (?, ?)",
+                [(job_id, keyword) for job_id, _, keywords in rating_states for keyword in keywords]
+            )
+        return len(rating_states)
+
+    def save_word_weights(self, weights_fingerprint: str, word_weights: dict) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO word_weights_versions (fingerprint, word_weights) VALUES (?, ?)",
+                (weights_fingerprint, json.dumps(word_weights))
+            )
+
+    def get_word_weights(self, weights_fingerprint: str) -> dict:
+        row = self.connection.execute("SELECT word_weights FROM word_weights_versions WHERE fingerprint=?", (weights_fingerprint,)).fetchone()
+        return json.loads(row['word_weights']) if row else None
+
+    def get_all_jobs(self) -> list[dict]:
+        cursor = self.connection.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY rating DESC")
+        return [self.row_to_job(row) for row in cursor]
+
+    def get_jobs_posted_since(self, since: date) -> list[dict]:
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs "
+            "WHERE posted_time >= ? AND posted_time GLOB '[0-9]*' ORDER BY rating DESC",
+            (since.isoformat(),)
+        )
+        return [self.row_to_job(row) for row in cursor]
+
+    @staticmethod
+    def normalize_keywords(keywords) -> str:
+        if isinstance(keywords, list):
+            return ','.join(keywords)
+        return keywords or ""
+
+    def job_to_row(self, job: dict) -> tuple:
+        job_id = get_job_id_from_url(job.get('url'))
+        if not job_id:
+            return None
+        return (
+            job_id,
+            int(bool(job.get('Applied', False))),
+            job.get('posted_time') or "",
+            job.get('title') or "",
+            job.get('company') or "",
+            job.get('industry') or "",
+            job.get('location') or "",
+            job.get('rating') or 0,
+            self.normalize_keywords(job.get('keywords')),
+            job.get('search') or "",
+            job.get('url') or "",
+            job.get('content') or "",
+        )
+
+    @staticmethod
+    def row_to_job(row: sqlite3.Row) -> dict:
+        job = dict(zip(JOB_COLUMNS, row))
+        job['Applied'] = bool(job['Applied'])
+        return job
@@ -1,5 +1,12 @@
 """This module contains different JavaScript conditions that can be used with WebDriverWait,
 
+    The wait_for_dom_quiet(driver) method is the preferred way of waiting for a page. It injects a
+    single async script that waits for the load event and then resolves once a MutationObserver has
+    seen no DOM changes for the quiet period. The Python side simply blocks on that one WebDriver
+    call instead of polling, so no CPU is burned while the page loads. Pages whose DOM never goes
+    quiet (ads, live counters) give up after a short cap so the caller can fall back to
+    wait_for_page_load instead.
+
     The wait_for_page_load(driver,timeout) method is not using WebDriverWait, and this is done
     to have better polling precision and reduce execution time to the minimum required amount.
 
@@ -28,9 +35,9 @@
         Worst-case total: 0.550s.
 """
 import logging
-from time import perf_counter
+from time import perf_counter, sleep
 
-from selenium.common.exceptions import JavascriptException
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
 from selenium.webdriver.remote.webdriver import WebDriver
 from tabulate import tabulate
 
@@ -38,6 +45,43 @@ _log = logging.getLogger(__name__)
 _log.addHandler(logging.NullHandler())
 
 PAGE_LOAD_TIMEOUT = 60
+DOM_QUIET_PERIOD = 0.5
+DOM_QUIET_TIMEOUT = 10
+# Gives the async script time to report back on its own before WebDriver gives up on it
+SCRIPT_TIMEOUT_MARGIN = 5
+
+DOM_QUIET_SCRIPT = """
+const quietPeriod = arguments[0];
+const maximumWait = arguments[1];
+const done = arguments[arguments.length - 1];
+let quietTimer = null;
+let finished = false;
+const observer = new MutationObserver(() => restartQuietTimer());
+const finish = (isQuiet) => {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(maximumWaitTimer);
+    done(isQuiet);
+};
+const restartQuietTimer = () => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietPeriod);
+};
+const startObserving = () => {
+    observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    restartQuietTimer();
+};
+const maximumWaitTimer = setTimeout(() => finish(false), maximumWait);
+if (document.readyState === "complete") {
+    startObserving();
+} else {
+    window.addEventListener("load", startObserving, {once: true});
+}
+"""
 
 
 class JsCondition:
@@ -52,13 +96,20 @@ class JsCondition:
 
     def __init__(self):
         self.confirmations_received = 0
+        # How often a confirmation streak was broken, which tells us whether the confirmations are needed at all
+        self.confirmation_resets = 0
+
+    def reset_confirmations(self):
+        if self.confirmations_received:
+            self.confirmation_resets += 1
+        self.confirmations_received = 0
 
     def __call__(self, driver):
         if driver.execute_script(self.script):
             self.confirmations_received += 1
             return self.confirmations_received >= self.confirmations_needed
         else:
-            self.confirmations_received = 0
+            self.reset_confirmations()
             return False
 
 
@@ -215,7 +266,7 @@ class NoNewElements(JsCondition):
             self.confirmations_received += 1
             return self.confirmations_received >= self.confirmations_needed
         else:
-            self.confirmations_received = 0
+            self.reset_confirmations()
             self.elements_count = current_count
             return False
 
@@ -242,17 +293,11 @@ CONDITIONS_MAP = {condition_cls.name: condition_cls
                   in PAGE_LOAD_CONDITIONS}
 
 
-def _busy_wait(duration):
-    end_time = duration + perf_counter()
-    while perf_counter() < end_time:
-        continue
-
-
 def wait_for_condition(driver, condition: JsCondition) -> bool:
     poll_frequency = condition.poll_frequency
     end_time = condition.timeout + perf_counter()
     while perf_counter() < end_time:
-        _busy_wait(poll_frequency)
+        sleep(poll_frequency)
         try:
             result = condition(driver)
             if result:
@@ -262,22 +307,34 @@ def wait_for_condition(driver, condition: JsCondition) -> bool:
     return False
 
 
-def wait_for_page_load(driver, *, timeout=PAGE_LOAD_TIMEOUT, log_details=True):
+def wait_for_page_load(driver, *, timeout=PAGE_LOAD_TIMEOUT, log_details=True, profile=None):
     """Waits for the page to load using pre-defined sequence of conditions.
 
     This method checks if the timeout has expired before checking the next condition,
     and will return after all conditions are checked, or after the last check that was
-    started before the timeout expired completes."""
+    started before the timeout expired completes.
+
+    When a learned profile for the site is given (see scraper_utils/page_load_profiles.py), conditions
+    that the site never satisfies are skipped as failed and the timeout and confirmations of the
+    rest are tuned from the timings that were observed on earlier loads."""
 
     remaining_time = timeout
     history = []
     condition_cls = PAGE_LOAD_CONDITIONS[0]
     while condition_cls and remaining_time > 0:
         condition = condition_cls()
+        if profile and profile.should_skip(condition):
+            history.append((condition.name, "skipped", 0.0, remaining_time))
+            condition_cls = CONDITIONS_MAP.get(condition.on_fail, None)
+            continue
+        if profile:
+            profile.tune(condition)
         start_time = perf_counter()
         is_met = wait_for_condition(driver, condition)
         took = perf_counter() - start_time
         remaining_time -= took
+        if profile:
+            profile.record(condition, is_met, took)
         history.append((condition.name, is_met, took, remaining_time))
         condition_cls = CONDITIONS_MAP.get((condition.on_success if is_met else condition.on_fail), None)
         if condition_cls is None:
@@ -291,6 +348,32 @@ def wait_for_page_load(driver, *, timeout=PAGE_LOAD_TIMEOUT, log_details=True):
         _log.debug("page load details:\n%s", details)
 
 
+def wait_for_dom_quiet(driver, *, quiet_period=DOM_QUIET_PERIOD, timeout=DOM_QUIET_TIMEOUT, profile=None):
+    """Waits for the load event and then for the DOM to go quiet for quiet_period seconds.
+
+    Returns True once the DOM was quiet, False if it kept changing until the timeout, and None when
+    the async script could not be run at all. In both of the latter cases the caller should fall back
+    to wait_for_page_load.
+
+    When a learned profile for the site is given, the timeout is capped at a multiple of the p95 time
+    the DOM took to go quiet on earlier loads of the site."""
+
+    if profile:
+        timeout = profile.get_dom_quiet_timeout(timeout, quiet_period)
+    start_time = perf_counter()
+    try:
+        driver.set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+        is_quiet = driver.execute_async_script(DOM_QUIET_SCRIPT, int(quiet_period * 1000), int(timeout * 1000))
+    except (JavascriptException, TimeoutException, WebDriverException) as e:
+        _log.debug(f"dom quiet wait failed: {e}")
+        return None
+    took = perf_counter() - start_time
+    if profile:
+        profile.record_dom_quiet(bool(is_quiet), took)
+    _log.debug(f"dom quiet: {is_quiet} (took: {took:.3f}s., timeout: {timeout:.3f}s.)")
+    return bool(is_quiet)
+
+
 def load_url(driver: WebDriver, url: str, *, timeout=PAGE_LOAD_TIMEOUT, log_details=True):
     _log.debug("loading url: '%s'", url)
     driver.get(url)
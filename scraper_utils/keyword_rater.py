@@ -0,0 +1,119 @@
+"""Rates job content against the word_weights from the customizations.
+
+The keywords are lowercased, de-duplicated and ordered once, so rating a job lowercases its content
+a single time and searches it for every distinct keyword with the C substring search. Keywords are
+searched for shortest first. A keyword that is missing rules out every longer keyword containing it,
+e.g. no 'form' means no 'terraform', so those are never searched for. The keywords and score match
+checking every keyword on its own.
+
+rate_batch spreads the content of the whole job history over every core. A job that was rated with
+earlier word_weights and kept its content can instead be rated from the keywords found in it back
+then with rate_delta, which only searches the content for the keywords that are new since.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# Smaller batches than this are rated in process as starting the worker processes costs more
+MINIMUM_PARALLEL_BATCH = 2000
+BATCH_CHUNK_SIZE = 500
+
+_worker_keyword_rater = None
+
+
+def get_weights_fingerprint(word_weights: dict) -> str:
+    # The order counts too as it is the order the keywords of a job are listed in
+    return hashlib.sha1(json.dumps(list(word_weights.items())).encode("utf-8")).hexdigest()
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def group_weights_by_lowered_keyword(word_weights: dict) -> dict[str, list[tuple[str, int]]]:
+    weights_by_lowered_keyword = {}
+    for keyword, weight in word_weights.items():
+        weights_by_lowered_keyword.setdefault(keyword.lower(), []).append((keyword, weight))
+    return weights_by_lowered_keyword
+
+
+class KeywordRater:
+
+    def __init__(self, word_weights: dict):
+        self.word_weights = dict(word_weights)
+        self.fingerprint = get_weights_fingerprint(self.word_weights)
+        # Keywords that only differ in case are the same keyword once the content is lowercased
+        self.weighted_keywords = [(keyword, keyword.lower(), weight) for keyword, weight in self.word_weights.items()]
+        self.lowered_keywords = sorted({lowered_keyword for _, lowered_keyword, _ in self.weighted_keywords}, key=len)
+        self.lowered_keyword_set = set(self.lowered_keywords)
+        self.containing_keywords = {
+            keyword: [other_keyword for other_keyword in self.lowered_keywords if other_keyword != keyword and keyword in other_keyword]
+            for keyword in self.lowered_keywords
+        }
+
+    def get_matched_keywords(self, content: str) -> set[str]:
+        if not self.lowered_keywords:
+            return set()
+        content = (content or "").lower()
+        found_keywords = set()
+        ruled_out_keywords = set()
+        for keyword in self.lowered_keywords:
+            if keyword in ruled_out_keywords:
+                continue
+            if keyword in content:
+                found_keywords.add(keyword)
+            else:
+                ruled_out_keywords.update(self.containing_keywords[keyword])
+        return found_keywords
+
+    def rate(self, content: str) -> tuple[list[str], int]:
+        return self.rate_found_keywords(self.get_matched_keywords(content))
+
+    def rate_found_keywords(self, found_keywords: set[str]) -> tuple[list[str], int]:
+        keywords = []
+        rating = 0
+        for keyword, lowered_keyword, weight in self.weighted_keywords:
+            if lowered_keyword in found_keywords:
+                keywords.append(keyword)
+                rating += weight
+        return keywords, rating
+
+    def get_changed_keywords(self, previous_word_weights: dict) -> set[str]:
+        """Returns the lowercased keywords that were added, removed or reweighted since the previous word_weights."""
+        previous_weights = group_weights_by_lowered_keyword(previous_word_weights)
+        current_weights = group_weights_by_lowered_keyword(self.word_weights)
+        return {
+            keyword for keyword in previous_weights.keys() | current_weights.keys()
+            if previous_weights.get(keyword) != current_weights.get(keyword)
+        }
+
+    def get_delta_rater(self, previous_word_weights: dict) -> "KeywordRater":
+        """Returns a rater for just the keywords that were not in the previous word_weights, for rate_delta."""
+        previous_keywords = {keyword.lower() for keyword in previous_word_weights}
+        return KeywordRater({keyword: weight for keyword, weight in self.word_weights.items() if keyword.lower() not in previous_keywords})
+
+    def rate_delta(self, content: str, previous_found_keywords: set[str], delta_rater: "KeywordRater") -> tuple[list[str], int]:
+        # Keywords that are still weighted were or were not found back then, only the new ones need searching for
+        found_keywords = (previous_found_keywords & self.lowered_keyword_set) | delta_rater.get_matched_keywords(content)
+        return self.rate_found_keywords(found_keywords)
+
+    def rate_batch(self, contents: list[str], processes: int = None) -> list[tuple[list[str], int]]:
+        if len(contents) < MINIMUM_PARALLEL_BATCH or processes == 1:
+            return [self.rate(content) for content in contents]
+        # Spawned like the browser workers so this is safe no matter what threads the parent has running
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes or None, initializer=initialize_worker_keyword_rater, initargs=(self.word_weights,)) as pool:
+            return pool.map(rate_in_worker, contents, chunksize=BATCH_CHUNK_SIZE)
+
+
+def initialize_worker_keyword_rater(word_weights: dict) -> None:
+    global _worker_keyword_rater
+    _worker_keyword_rater = KeywordRater(word_weights)
+
+
+def rate_in_worker(content: str) -> tuple[list[str], int]:
+    return _worker_keyword_rater.rate(content)
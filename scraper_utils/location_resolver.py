@@ -0,0 +1,68 @@
+"""Finds the location line among the lines of text of a job result card.
+
+A line is a location when, in order of preference, it:
+
+    1. ends in ', <US state or territory abbreviation>', e.g. 'Arlington, VA'
+    2. mentions the United States
+    3. contains one of the locations or excluded locations from the customizations
+    4. is a metro area such as 'Washington DC-Baltimore Area'
+
+The state table and a single pattern for the customization locations are built once per run, and
+the verdict for every line is memoized since the same handful of locations show up on card after
+card.
+"""
+import logging
+import re
+from functools import lru_cache
+
+import us
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+STATE_ABBREVIATION_PATTERN = re.compile(r", ([A-Z][A-Z])$")
+US_STATE_ABBREVIATIONS = frozenset([state.abbr for state in us.states.STATES_AND_TERRITORIES] + ["DC"])
+MEMOIZED_LINES = 8192
+
+STATE_MATCH = 0
+UNITED_STATES_MATCH = 1
+CUSTOMIZATION_MATCH = 2
+AREA_MATCH = 3
+
+
+class LocationResolver:
+
+    def __init__(self, customization_locations: list[str]):
+        customization_locations = [location.strip() for location in customization_locations if location.strip()]
+        self.customization_location_pattern = None
+        if customization_locations:
+            self.customization_location_pattern = re.compile(
+                "|".join(re.escape(location) for location in customization_locations), re.IGNORECASE
+            )
+        self.get_match_rank = lru_cache(maxsize=MEMOIZED_LINES)(self.rank_line)
+
+    def rank_line(self, line: str) -> int:
+        state_match = STATE_ABBREVIATION_PATTERN.search(line)
+        if state_match and state_match.group(1) in US_STATE_ABBREVIATIONS:
+            return STATE_MATCH
+        if "United States" in line:
+            return UNITED_STATES_MATCH
+        if self.customization_location_pattern and self.customization_location_pattern.search(line):
+            return CUSTOMIZATION_MATCH
+        if line.endswith(" Area"):
+            return AREA_MATCH
+        return None
+
+    def find_location_index(self, lines: list[str]) -> int:
+        """Returns the index of the line that is most likely the location, or None when no line looks like one."""
+        best_index = None
+        best_rank = None
+        for index, line in enumerate(lines):
+            rank = self.get_match_rank(line)
+            if rank is None or (best_rank is not None and rank >= best_rank):
+                continue
+            best_index = index
+            best_rank = rank
+            if rank == STATE_MATCH:
+                break
+        return best_index
@@ -0,0 +1,238 @@
+"""Learned, per-site tuning of the js_conditions page load chain.
+
+Every site only needs a handful of the conditions in js_conditions.PAGE_LOAD_CONDITIONS. LinkedIn,
+for example, never defines jQuery or Angular, yet every load pays for probing them. A profile is
+kept for every host that records how often each condition was met and how long it took, and it is
+used to:
+
+    * skip the '*_defined' probes that have never been met on the host (they are re-probed every
+      so often in case the site changes),
+    * shrink the timeout of every other condition to a multiple of its observed p95 duration, and
+    * drop the confirmations needed to half for conditions whose confirmation streak has never
+      been broken on the host, and
+    * cap the js_conditions.wait_for_dom_quiet wait at a multiple of the p95 time the host's DOM
+      took to go quiet, so pages that never go quiet fall back to the condition chain quickly.
+
+The profiles are saved to disk so the tuning carries over between runs. Browser workers tune their
+loads with a WorkerPageLoadProfiles that sends what it observed to the parent process instead of
+saving, and the parent merges the observations of every worker into the one copy it saves.
+"""
+import json
+import logging
+import math
+import os
+from datetime import datetime
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# Number of observations of a condition before we trust what we have learned about it
+MINIMUM_OBSERVATIONS = 25
+# A probe that is being skipped still gets re-checked once in this many loads
+REPROBE_EVERY = 100
+# Only this many of the most recent durations are kept per condition
+MAXIMUM_SAMPLES = 200
+TIMEOUT_P95_MULTIPLIER = 3
+# The wait_for_dom_quiet timings are kept next to the conditions under this name
+DOM_QUIET = "dom_quiet"
+SAVE_EVERY_LOADS = 50
+
+
+class ConditionStats:
+
+    def __init__(self, observations: int = 0, met: int = 0, skipped: int = 0, confirmation_resets: int = 0, durations: list = None):
+        self.observations = observations
+        self.met = met
+        self.skipped = skipped
+        self.confirmation_resets = confirmation_resets
+        self.durations = durations or []
+
+    def get_counts(self) -> tuple[int, int, int, int]:
+        return self.observations, self.met, self.skipped, self.confirmation_resets
+
+    def to_json(self) -> dict:
+        return {
+            "observations": self.observations,
+            "met": self.met,
+            "skipped": self.skipped,
+            "confirmation_resets": self.confirmation_resets,
+            "durations": self.durations,
+        }
+
+    def get_p95_duration(self) -> float:
+        sorted_durations = sorted(self.durations)
+        return sorted_durations[min(len(sorted_durations) - 1, math.ceil(len(sorted_durations) * 0.95) - 1)]
+
+
+class HostProfile:
+
+    def __init__(self, condition_stats: dict = None):
+        self.condition_stats = condition_stats or {}
+
+    def get_stats(self, condition) -> ConditionStats:
+        if condition.name not in self.condition_stats:
+            self.condition_stats[condition.name] = ConditionStats()
+        return self.condition_stats[condition.name]
+
+    def should_skip(self, condition) -> bool:
+        if not condition.name.endswith("_defined"):
+            return False
+        stats = self.get_stats(condition)
+        if stats.observations < MINIMUM_OBSERVATIONS or stats.met > 0:
+            return False
+        stats.skipped += 1
+        # Every so often we check again in case the site started using the library
+        return stats.skipped % REPROBE_EVERY != 0
+
+    def tune(self, condition) -> None:
+        stats = self.get_stats(condition)
+        if stats.met < MINIMUM_OBSERVATIONS:
+            return
+        minimum_timeout = condition.poll_frequency * condition.confirmations_needed * 2
+        learned_timeout = stats.get_p95_duration() * TIMEOUT_P95_MULTIPLIER
+        condition.timeout = min(condition.timeout, max(minimum_timeout, learned_timeout))
+        if stats.confirmation_resets == 0:
+            condition.confirmations_needed = max(1, condition.confirmations_needed // 2)
+
+    def record(self, condition, is_met: bool, took: float) -> None:
+        stats = self.get_stats(condition)
+        stats.observations += 1
+        stats.confirmation_resets += condition.confirmation_resets
+        if is_met:
+            stats.met += 1
+            stats.durations.append(round(took, 4))
+            del stats.durations[:-MAXIMUM_SAMPLES]
+
+    def get_dom_quiet_timeout(self, maximum_timeout: float, quiet_period: float) -> float:
+        stats = self.condition_stats.get(DOM_QUIET)
+        if not stats or stats.met < MINIMUM_OBSERVATIONS:
+            return maximum_timeout
+        minimum_timeout = quiet_period * 2
+        learned_timeout = stats.get_p95_duration() * TIMEOUT_P95_MULTIPLIER
+        return min(maximum_timeout, max(minimum_timeout, learned_timeout))
+
+    def record_dom_quiet(self, is_quiet: bool, took: float) -> None:
+        stats = self.condition_stats.setdefault(DOM_QUIET, ConditionStats())
+        stats.observations += 1
+        if is_quiet:
+            stats.met += 1
+            stats.durations.append(round(took, 4))
+            del stats.durations[:-MAXIMUM_SAMPLES]
+
+
+class PageLoadProfiles:
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self.host_profiles = {}
+        self.unsaved_loads = 0
+        self.has_unsaved_changes = False
+        self.load()
+        # What every condition's counts were when its changes were last collected
+        self.collected_counts = self.get_all_counts()
+
+    def load(self) -> None:
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            for host, condition_stats in state['hosts'].items():
+                self.host_profiles[host] = HostProfile({
+                    name: ConditionStats(**stats) for name, stats in condition_stats.items()
+                })
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            _log.info(f"Ignoring the unreadable page load profiles '{self.state_path}': {e}")
+            self.host_profiles = {}
+
+    def save(self) -> None:
+        # A copy that never recorded or merged anything would only overwrite what others learned
+        if not self.has_unsaved_changes:
+            return
+        state = {
+            "updated": datetime.now().isoformat(),
+            "hosts": {
+                host: {name: stats.to_json() for name, stats in host_profile.condition_stats.items()}
+                for host, host_profile in self.host_profiles.items()
+            },
+        }
+        temporary_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "w") as f:
+                json.dump(state, f)
+            os.replace(temporary_path, self.state_path)
+        except OSError as e:
+            # Losing some of the tuning is not worth failing the page load that triggered the save
+            _log.info(f"Could not save the page load profiles to '{self.state_path}': {e}")
+            return
+        self.unsaved_loads = 0
+        self.has_unsaved_changes = False
+
+    def get(self, host: str) -> HostProfile:
+        if host not in self.host_profiles:
+            self.host_profiles[host] = HostProfile()
+        # Getting a profile means a page load is about to be recorded into it
+        self.has_unsaved_changes = True
+        self.unsaved_loads += 1
+        if self.unsaved_loads >= SAVE_EVERY_LOADS:
+            self.save()
+        return self.host_profiles[host]
+
+    def get_all_counts(self) -> dict[tuple[str, str], tuple[int, int, int, int]]:
+        return {
+            (host, name): stats.get_counts()
+            for host, host_profile in self.host_profiles.items()
+            for name, stats in host_profile.condition_stats.items()
+        }
+
+    def collect_changes(self) -> dict:
+        """Returns what every condition observed since the changes were last collected, for merge_changes."""
+        changes = {}
+        for host, host_profile in self.host_profiles.items():
+            for name, stats in host_profile.condition_stats.items():
+                previous_counts = self.collected_counts.get((host, name), (0, 0, 0, 0))
+                count_changes = [count - previous_count for count, previous_count in zip(stats.get_counts(), previous_counts)]
+                if not any(count_changes):
+                    continue
+                observations, met, skipped, confirmation_resets = count_changes
+                changes.setdefault(host, {})[name] = {
+                    "observations": observations,
+                    "met": met,
+                    "skipped": skipped,
+                    "confirmation_resets": confirmation_resets,
+                    # Every met observation added one duration
+                    "durations": stats.durations[len(stats.durations) - min(met, len(stats.durations)):],
+                }
+        self.collected_counts = self.get_all_counts()
+        return changes
+
+    def merge_changes(self, changes: dict) -> None:
+        for host, condition_changes in changes.items():
+            host_profile = self.host_profiles.setdefault(host, HostProfile())
+            for name, change in condition_changes.items():
+                stats = host_profile.condition_stats.setdefault(name, ConditionStats())
+                stats.observations += change['observations']
+                stats.met += change['met']
+                stats.skipped += change['skipped']
+                stats.confirmation_resets += change['confirmation_resets']
+                stats.durations.extend(change['durations'])
+                del stats.durations[:-MAXIMUM_SAMPLES]
+        if changes:
+            self.has_unsaved_changes = True
+
+
+class WorkerPageLoadProfiles(PageLoadProfiles):
+    """Tunes a browser worker's page loads and sends what it observed to the parent, which does the saving."""
+
+    def __init__(self, browser_worker, state_path: str):
+        self.browser_worker = browser_worker
+        super().__init__(state_path)
+
+    def save(self) -> None:
+        if not self.has_unsaved_changes:
+            return
+        changes = self.collect_changes()
+        if changes:
+            self.browser_worker.record_page_load_profiles(changes)
+        self.unsaved_loads = 0
+        self.has_unsaved_changes = False
@@ -0,0 +1,138 @@
+"""Records the pages and XHR fragments of a real run so that it can be replayed offline.
+
+Every document the scraper navigates to is saved with its scripts stripped, as the DOM looked once
+it had loaded. Every XHR or fetch response that comes back with HTML is saved too. That covers the
+extra batches of results and the job detail panes LinkedIn loads in the background. The responses
+are read from Chrome's performance log, which needs the driver to be started with the capability
+from enable_performance_logging, and their bodies come from the DevTools Protocol.
+
+Everything is stored under the recording key of its URL, which the replay server uses to find it
+again. A manifest lists the result fragments every document loaded, in order, so that the replay
+can hand them out as the scraper scrolls. The manifest is only written when save is called, which the
+scraper does at the end of every search and location unit and at shutdown.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# Tracking parameters change on every request and have nothing to do with what the page shows
+VOLATILE_QUERY_PARAMETERS = {"trk", "trackingId", "refId", "position", "pageNum", "currentJobId", "original_referer"}
+SCRIPT_TAG_PATTERN = re.compile(r"<script\b.*?</script>", re.IGNORECASE | re.DOTALL)
+UNSAFE_PATH_CHARACTERS = re.compile(r"[^A-Za-z0-9._/-]")
+DETAIL_FRAGMENT_PATTERN = re.compile(r"/jobs-guest/jobs/api/jobPosting/")
+RECORDED_RESOURCE_TYPES = {"XHR", "Fetch"}
+MANIFEST_FILENAME = "manifest.json"
+
+
+def get_recording_key(url: str) -> str:
+    parsed_url = urlparse(url)
+    path = UNSAFE_PATH_CHARACTERS.sub("_", parsed_url.path.strip("/")) or "index"
+    path = path.replace("..", "_")
+    query_parameters = sorted(
+        (name, value) for name, value in parse_qsl(parsed_url.query) if name not in VOLATILE_QUERY_PARAMETERS
+    )
+    if not query_parameters:
+        return path
+    query_hash = hashlib.sha1(urlencode(query_parameters).encode("utf-8")).hexdigest()[:12]
+    return f"{path}__{query_hash}"
+
+
+def get_recording_path(recording_directory: str, key: str) -> str:
+    return os.path.join(recording_directory, "pages", key + ".html")
+
+
+def enable_performance_logging(options) -> None:
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+class PageRecorder:
+
+    def __init__(self, recording_directory: str):
+        self.recording_directory = recording_directory
+        os.makedirs(recording_directory, exist_ok=True)
+        self.manifest = {"documents": {}}
+        self.current_document_key = None
+        self.current_document_url = None
+        self.unsaved_changes = False
+        self.load()
+
+    def load(self) -> None:
+        manifest_path = os.path.join(self.recording_directory, MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            return
+        try:
+            with open(manifest_path, "r") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            _log.info(f"Starting a new manifest as '{manifest_path}' is unreadable: {e}")
+
+    def save(self) -> None:
+        if not self.unsaved_changes:
+            return
+        manifest_path = os.path.join(self.recording_directory, MANIFEST_FILENAME)
+        temporary_path = manifest_path + ".tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temporary_path, manifest_path)
+        self.unsaved_changes = False
+
+    def write_recording(self, url: str, body: str) -> str:
+        key = get_recording_key(url)
+        recording_path = get_recording_path(self.recording_directory, key)
+        os.makedirs(os.path.dirname(recording_path), exist_ok=True)
+        with open(recording_path, "w") as f:
+            f.write(body)
+        return key
+
+    def record_page(self, driver: WebDriver) -> None:
+        try:
+            current_url = driver.current_url
+            # Scrolling loads more into the same document and that is captured as fragments instead
+            if current_url != self.current_document_url:
+                page_source = SCRIPT_TAG_PATTERN.sub("", driver.page_source)
+                self.current_document_key = self.write_recording(current_url, page_source)
+                self.current_document_url = current_url
+                self.manifest['documents'][self.current_document_key] = {"url": current_url, "fragments": []}
+                self.unsaved_changes = True
+        except WebDriverException as e:
+            _log.info(f"Failed to record the page: {e}")
+            return
+        self.record_fragments(driver)
+
+    def record_fragments(self, driver: WebDriver) -> None:
+        try:
+            performance_log = driver.get_log("performance")
+        except WebDriverException as e:
+            _log.info(f"Failed to read the performance log so no fragments were recorded: {e}")
+            return
+        for entry in performance_log:
+            message = json.loads(entry['message'])['message']
+            if message['method'] != "Network.responseReceived":
+                continue
+            if message['params']['type'] not in RECORDED_RESOURCE_TYPES:
+                continue
+            response = message['params']['response']
+            if "html" not in response.get('mimeType', ""):
+                continue
+            try:
+                response_body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": message['params']['requestId']})
+            except WebDriverException:
+                # The body is gone once Chrome evicts it from its buffer
+                continue
+            self.write_recording(response['url'], response_body['body'])
+            if DETAIL_FRAGMENT_PATTERN.search(response['url']) or not self.current_document_key:
+                continue
+            fragments = self.manifest['documents'][self.current_document_key]['fragments']
+            fragment_path = urlparse(response['url'])._replace(scheme="", netloc="").geturl()
+            if fragment_path not in fragments:
+                fragments.append(fragment_path)
+                self.unsaved_changes = True
@@ -0,0 +1,249 @@
+"""Micro-benchmarks for the per-card parsing, exclusion and rating code, no browser needed.
+
+Every result card of a run goes through JobPosting.parse_posting_element_text and its pop_* helpers,
+the exclusion checks and the keyword rating. This pushes thousands of card text blobs, job contents
+and results pages through the same JobPosting methods the scraper uses, driven by a stand in for
+TheJobScraper. It reports operations per second and the peak memory allocated per operation.
+
+The cards come from a PageRecorder recording when one is given and are generated otherwise. Saving a
+baseline and comparing against it later fails the run (exit code 1) when any benchmark loses more
+than the threshold of its throughput:
+
+    python -m scraper_utils.parser_benchmark --save-baseline
+    python -m scraper_utils.parser_benchmark [--recording <directory>] [--threshold 0.2]
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import yaml
+
+from scraper_utils.result_cards import extract_result_cards_from_html
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(REPOSITORY_DIRECTORY, "scrapes", "parser_benchmark_baseline.json")
+
+TITLES = ["Cloud Engineer", "Senior Security Engineer", "DevOps Engineer II", "Site Reliability Engineer", "Engineering Manager"]
+COMPANIES = ["Acme Corp", "Initech", "Globex Corporation", "ClearanceJobs", "Umbrella Health"]
+LOCATIONS = ["Arlington, VA", "Baltimore, MD", "United States", "Washington DC-Baltimore Area", "Greater Boston Area", "Remote", "Toronto, ON"]
+EXTRAS = ["Actively Hiring", "Be an early applicant", "Easy Apply"]
+TIMESPANS = ["2 minutes ago", "5 hours ago", "1 day ago", "3 weeks ago", "1 month ago"]
+INDUSTRIES = ["Software Development", "Staffing and Recruiting", "Defense and Space Manufacturing", "Hospitals and Health Care"]
+CONTENT_WORDS = ["we", "are", "looking", "for", "an", "engineer", "with", "experience", "in", "cloud", "platforms", "and", "automation"]
+
+
+class BenchmarkScraper:
+    """Just enough of TheJobScraper for a JobPosting to parse, exclude and rate without a browser."""
+
+    def __init__(self, customizations: dict):
+        # Imported here so that importing this module does not pull in the us package
+        from scraper_utils.exclusion_rules import ExclusionRules
+        from scraper_utils.keyword_rater import KeywordRater
+        from scraper_utils.location_resolver import LocationResolver
+
+        self.customizations = customizations
+        self.location_resolver = LocationResolver(customizations['excluded_locations'] + customizations['locations'])
+        self.exclusion_rules = ExclusionRules.from_customizations(customizations)
+        self.keyword_rater = KeywordRater(customizations['word_weights'])
+        self.app_config = {}
+        self.rate_controller = None
+        self.run_deadline = None
+        self.driver = None
+        self.scraped_job_ids = set()
+        self.current_search = "benchmark"
+
+    def log(self, message: str) -> None:
+        pass
+
+
+def load_customizations(customizations_path: str = None) -> dict:
+    if not customizations_path:
+        customizations_path = os.path.join(REPOSITORY_DIRECTORY, "customizations.yaml")
+        if not os.path.exists(customizations_path):
+            customizations_path = os.path.join(REPOSITORY_DIRECTORY, "customizations_default.yaml")
+    with open(customizations_path, "r") as f:
+        return yaml.load(f, Loader=yaml.FullLoader)
+
+
+def generate_cards(card_count: int, customizations: dict, seed: int = 1337) -> list[dict]:
+    random_generator = random.Random(seed)
+    locations = LOCATIONS + customizations['locations'] + customizations['excluded_locations']
+    cards = []
+    for job_id in range(card_count):
+        title = random_generator.choice(TITLES)
+        # LinkedIn repeats the title for screen readers
+        lines = [title, title, random_generator.choice(COMPANIES), random_generator.choice(locations)]
+        lines += random_generator.sample(EXTRAS, random_generator.randint(0, 2))
+        lines.append(random_generator.choice(TIMESPANS))
+        lines[3:] = random_generator.sample(lines[3:], len(lines) - 3)
+        cards.append({
+            "url": f"https://www.linkedin.com/jobs/view/benchmark-job-{job_id}",
+            "title": "",
+            "company": "",
+            "location": "",
+            "datetime": "",
+            "text": "\n".join(lines),
+        })
+    return cards
+
+
+def generate_contents(content_count: int, customizations: dict, seed: int = 1337) -> list[str]:
+    random_generator = random.Random(seed)
+    keywords = list(customizations['word_weights'].keys())
+    contents = []
+    for _ in range(content_count):
+        words = random_generator.choices(CONTENT_WORDS, k=400)
+        for _ in range(random_generator.randint(0, 6)):
+            words.insert(random_generator.randrange(len(words)), random_generator.choice(keywords).upper())
+        contents.append(" ".join(words))
+    return contents
+
+
+def generate_results_pages(cards: list[dict], cards_per_page: int = 25) -> list[str]:
+    results_pages = []
+    for page_start in range(0, len(cards), cards_per_page):
+        list_items = "".join(
+            f'<li><div class="base-card"><a href="{card["url"]}"></a>'
+            + "".join(f"<span>{line}</span>" for line in card['text'].split("\n"))
+            + '<time datetime="2024-01-01"></time></div></li>'
+            for card in cards[page_start:page_start + cards_per_page]
+        )
+        results_pages.append(f'<html><body><section class="two-pane-serp-page__results-list"><ul>{list_items}</ul></section></body></html>')
+    return results_pages
+
+
+def load_recorded_results_pages(recording_directory: str) -> list[str]:
+    results_pages = []
+    for recording_path in glob.glob(os.path.join(recording_directory, "pages", "**", "*.html"), recursive=True):
+        if "jobPosting" in recording_path:
+            continue
+        with open(recording_path, "r") as f:
+            results_pages.append(f.read())
+    return results_pages
+
+
+def build_benchmarks(cards: list[dict], contents: list[str], results_pages: list[str], customizations: dict) -> dict[str, tuple[Callable, list]]:
+    # Imported here so that importing this module does not pull in selenium and friends
+    from job_scraper import JobPosting
+
+    benchmark_scraper = BenchmarkScraper(customizations)
+
+    def parse_card(card: dict) -> None:
+        JobPosting(None, 0, benchmark_scraper, card).parse_posting_element_text()
+
+    def exclude_card(card: dict) -> None:
+        JobPosting(None, 0, benchmark_scraper, card).is_a_excluded_title_or_company_or_location()
+
+    def exclude_industry(industry: str) -> None:
+        job_posting = JobPosting(None, 0, benchmark_scraper)
+        job_posting.job_details = {"industry": industry}
+        job_posting.is_a_excluded_industry()
+
+    def rate_content(content: str) -> None:
+        job_posting = JobPosting(None, 0, benchmark_scraper)
+        job_posting.content = content
+        job_posting.get_job_posting_keywords_and_rating()
+
+    industries = [INDUSTRIES[index % len(INDUSTRIES)] for index in range(len(cards))]
+    return {
+        "parse_card_text": (parse_card, cards),
+        "exclude_title_company_location": (exclude_card, cards),
+        "exclude_industry": (exclude_industry, industries),
+        "rate_content": (rate_content, contents),
+        "extract_cards_from_html": (extract_result_cards_from_html, results_pages),
+    }
+
+
+def run_benchmark(function: Callable, inputs: list, repeats: int) -> dict:
+    best_duration = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for benchmark_input in inputs:
+            function(benchmark_input)
+        best_duration = min(best_duration, time.perf_counter() - start_time)
+    # A separate pass as tracing the allocations slows everything down
+    total_peak_bytes = 0
+    tracemalloc.start()
+    for benchmark_input in inputs:
+        tracemalloc.reset_peak()
+        starting_bytes, _ = tracemalloc.get_traced_memory()
+        function(benchmark_input)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        total_peak_bytes += peak_bytes - starting_bytes
+    tracemalloc.stop()
+    return {
+        "ops_per_second": len(inputs) / best_duration,
+        "peak_bytes_per_op": total_peak_bytes / max(len(inputs), 1),
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        minimum_ops_per_second = baseline[name]['ops_per_second'] * (1 - threshold)
+        if result['ops_per_second'] < minimum_ops_per_second:
+            regressions.append(f"{name} dropped to {result['ops_per_second']:.0f} ops/s from a baseline of {baseline[name]['ops_per_second']:.0f} ops/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the JobPosting parsing, exclusion and rating code")
+    parser.add_argument("--cards", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--customizations", default=None)
+    parser.add_argument("--recording", default=None, help="PageRecorder directory to take the results pages from")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Fraction of the baseline throughput a benchmark may lose")
+    arguments = parser.parse_args()
+
+    customizations = load_customizations(arguments.customizations)
+    if arguments.recording:
+        results_pages = load_recorded_results_pages(arguments.recording)
+        cards = [card for results_page in results_pages for card in extract_result_cards_from_html(results_page)]
+        # The recorded cards are used as text blobs so the parsing code has to do all of the work
+        cards = [dict(card, title="", company="", location="") for card in cards]
+    else:
+        cards = generate_cards(arguments.cards, customizations)
+        results_pages = generate_results_pages(cards)
+    contents = generate_contents(len(cards), customizations)
+    print(f"Benchmarking {len(cards)} cards and {len(results_pages)} results pages")
+
+    results = {}
+    for name, (function, inputs) in build_benchmarks(cards, contents, results_pages, customizations).items():
+        results[name] = run_benchmark(function, inputs, arguments.repeats)
+        print(f"{name:<32} {results[name]['ops_per_second']:>12.0f} ops/s {results[name]['peak_bytes_per_op']:>10.0f} peak bytes/op")
+
+    if arguments.save_baseline:
+        os.makedirs(os.path.dirname(arguments.baseline), exist_ok=True)
+        with open(arguments.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved the baseline to '{arguments.baseline}'")
+        return
+    if not os.path.exists(arguments.baseline):
+        print("There is no baseline to compare against, run with --save-baseline to make one")
+        return
+    with open(arguments.baseline, "r") as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, arguments.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"No benchmark lost more than {arguments.threshold:.0%} of its baseline throughput")
+
+
+if __name__ == '__main__':
+    main()
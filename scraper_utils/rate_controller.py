@@ -0,0 +1,122 @@
+"""Adaptive request pacing shared by everything that talks to LinkedIn.
+
+The controller follows AIMD (additive increase, multiplicative decrease). Every page that loads
+cleanly nudges the request rate up by a fixed amount, and every 429 or redirect cuts it by a
+factor. The delay between requests is the inverse of that rate. Retries wait for the current delay
+doubled once per attempt, so they stay short while the site is healthy and back off hard while we
+are being throttled. The state is saved to disk so the next run starts at the rate we learned.
+
+Browser workers pace themselves with a WorkerRateController that reports every success and throttle
+to the parent process. The parent's controller is the only one that saves the state, and it learns
+from the requests of every worker since they all come from the same address.
+"""
+import json
+import logging
+import os
+import random
+from datetime import datetime
+from time import sleep
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# Saving after every single clean page load would be wasteful so we only do it every so often
+SAVE_EVERY_SUCCESSES = 10
+
+
+class AdaptiveRateController:
+
+    def __init__(self, state_path: str, initial_delay: float, minimum_delay: float, maximum_delay: float,
+                 rate_increase: float, rate_decrease_factor: float, maximum_backoff: float, jitter: float = 0.25):
+        self.state_path = state_path
+        self.minimum_delay = minimum_delay
+        self.maximum_delay = maximum_delay
+        self.rate_increase = rate_increase
+        self.rate_decrease_factor = rate_decrease_factor
+        self.maximum_backoff = maximum_backoff
+        self.jitter = jitter
+        self.delay = initial_delay
+        self.successes = 0
+        self.throttles = 0
+        self.unsaved_successes = 0
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            self.delay = self.clamp(float(state['delay']))
+        except (OSError, ValueError, KeyError) as e:
+            _log.info(f"Ignoring the unreadable rate controller state '{self.state_path}': {e}")
+            return
+        _log.info(f"Starting with a delay of {self.delay:.2f}s between requests from the saved rate controller state")
+
+    def save(self) -> None:
+        state = {
+            "delay": self.delay,
+            "updated": datetime.now().isoformat(),
+        }
+        temporary_path = self.state_path + ".tmp"
+        try:
+            with open(temporary_path, "w") as f:
+                json.dump(state, f)
+            os.replace(temporary_path, self.state_path)
+        except OSError as e:
+            # Losing the learned rate is not worth failing the page load that triggered the save
+            _log.info(f"Could not save the rate controller state to '{self.state_path}': {e}")
+            return
+        self.unsaved_successes = 0
+
+    def clamp(self, delay: float) -> float:
+        return min(self.maximum_delay, max(self.minimum_delay, delay))
+
+    def wait(self) -> None:
+        # Jitter keeps us from looking like a metronome
+        sleep(self.delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.unsaved_successes += 1
+        self.delay = self.clamp(1 / (1 / self.delay + self.rate_increase))
+        if self.unsaved_successes >= SAVE_EVERY_SUCCESSES:
+            self.save()
+
+    def record_throttle(self) -> None:
+        self.throttles += 1
+        self.delay = self.clamp(self.delay / self.rate_decrease_factor)
+        _log.info(f"We are being throttled so the delay between requests is now {self.delay:.2f}s")
+        self.save()
+
+    def get_backoff_wait(self, attempt_number: int) -> float:
+        backoff = self.delay * (2 ** (attempt_number - 1))
+        return min(self.maximum_backoff, backoff * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class WorkerRateController(AdaptiveRateController):
+    """Paces a browser worker and reports to the parent, which owns the saved state, instead of saving."""
+
+    def __init__(self, browser_worker, *args, **kwargs):
+        self.browser_worker = browser_worker
+        super().__init__(*args, **kwargs)
+
+    def save(self) -> None:
+        self.unsaved_successes = 0
+
+    def record_success(self) -> None:
+        super().record_success()
+        self.browser_worker.record_rate_event("success")
+
+    def record_throttle(self) -> None:
+        super().record_throttle()
+        self.browser_worker.record_rate_event("throttle")
+
+
+def wait_for_rate_controller(retry_state) -> float:
+    """Tenacity wait strategy that asks the rate controller of the decorated object how long to back off.
+
+    The back off never runs past the run deadline of the decorated object."""
+    decorated_object = retry_state.args[0]
+    backoff = decorated_object.rate_controller.get_backoff_wait(retry_state.attempt_number)
+    return decorated_object.run_deadline.cap_wait(backoff)
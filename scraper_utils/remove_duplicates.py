@@ -1,48 +1,52 @@
+"""Removes the jobs that were already found by an earlier scrape from the dated job scrapes.
+
+The jobs that are left are added to the job store when it does not have them yet. Run it from the
+repository directory:
+
+    python -m scraper_utils.remove_duplicates
+"""
 import os
+import re
 import json
 
-def is_a_duplicate(job_posting_url: str, all_jobs: list[dict]):
-    if not job_posting_url:
-        return True
-    split_newly_found_job_url = job_posting_url.split("/view/")
-    if len(split_newly_found_job_url) != 2:
-        return True
-    newly_found_job_url = split_newly_found_job_url[1].lower()
-    for job in all_jobs:
-        previously_found_job_url = job['url'].split("/view/")[1].lower()
-        duplicate_job_posting_url = previously_found_job_url == newly_found_job_url
-        if duplicate_job_posting_url:
-            return True
-    return False
+import yaml
+
+from scraper_utils.job_store import JobStore, get_job_id_from_url
+
+# Only the dated job scrapes, the job store and the other state files live next to them
+SCRAPE_FILENAME_PATTERN = re.compile(r"^\d{2}_\d{2}_\d{4}_\d{2}_\d{2}\.json$")
 
+with open('config.yaml', 'r') as f:
+    app_config = yaml.safe_load(f)
 total_duplicates = 0
 scrapes = []
-all_jobs = []
-job_scrape_dir = 'scrapes'
+seen_job_ids = set()
+job_scrape_dir = app_config['new_job_scrapes_directory']
 for scrape in os.listdir(job_scrape_dir):
-    filepath = os.path.join(job_scrape_dir, scrape)
-    if filepath == "scrapes/.keep":
-            continue
-    scrapes.append(filepath)
+    if not SCRAPE_FILENAME_PATTERN.match(scrape):
+        continue
+    scrapes.append(os.path.join(job_scrape_dir, scrape))
 scrapes.sort()
 print(scrapes)
-for filepath in scrapes:
-    new_scrape_data = []
-    duplicates_in_scrape = 0
-    with open(filepath, 'r') as f:
-        job_data = json.load(f)
+with JobStore(app_config['jobs_database_filepath']) as job_store:
+    for filepath in scrapes:
+        new_scrape_data = []
+        duplicates_in_scrape = 0
+        with open(filepath, 'r') as f:
+            job_data = json.load(f)
         for job in job_data:
-            if not job["url"]:
+            job_id = get_job_id_from_url(job["url"])
+            if not job_id:
                 continue
-            if is_a_duplicate(job["url"], all_jobs):
+            if job_id in seen_job_ids:
                 total_duplicates += 1
                 duplicates_in_scrape += 1
                 continue
-            all_jobs.append(job)
+            seen_job_ids.add(job_id)
             new_scrape_data.append(job)
-    print(f"Total duplicates found in {filepath}: {duplicates_in_scrape}")
-    with open(filepath, 'w') as f:
-        json.dump(new_scrape_data, f)
+        print(f"Total duplicates found in {filepath}: {duplicates_in_scrape}")
+        with open(filepath, 'w') as f:
+            json.dump(new_scrape_data, f)
+        # The job store is keyed by job id so it cannot hold duplicates, it only needs any jobs it is missing
+        job_store.insert_missing_jobs(new_scrape_data)
 print(f"Total duplicates found: {total_duplicates}")
-with open("all_jobs.json", 'w') as f:
-    json.dump(all_jobs, f)
@@ -0,0 +1,171 @@
+"""Replays a run recorded by PageRecorder from a local HTTP server for offline end to end benchmarks.
+
+Every request is answered with the recording of its URL. LinkedIn links in the recorded pages are
+pointed back at the replay server, and a small shim stands in for the scripts that were stripped
+when recording. Scrolling to the bottom or pressing 'See more jobs' appends the next recorded
+fragment of results to the results list. Clicking a job card loads its recorded detail fragment
+into the details pane.
+
+Run it directly to replay a recording through the whole scrape_jobs_from_linkedin pipeline. The
+run's state files go to a scratch directory so the real job store and history are left alone:
+
+    python -m scraper_utils.replay_server <recording directory>
+"""
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+from scraper_utils.fixture_server import FixtureRequestHandler, FixtureServer
+from scraper_utils.page_recorder import MANIFEST_FILENAME, get_recording_key, get_recording_path
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+LINKEDIN_URL_PATTERN = re.compile(rb"https?://([a-z]{2,3}\.)?(www\.)?linkedin\.com")
+RESULTS_LIST_SELECTOR = "section[class*='results-list'] > ul"
+SEE_MORE_JOBS_SELECTOR = ".infinite-scroller__show-more-button"
+DETAILS_PANE_SELECTOR = ".details-pane__content"
+
+REPLAY_SHIM_SCRIPT = """
+<script>
+(() => {
+    const fragments = %(fragments)s;
+    let nextFragment = 0;
+    let loading = false;
+    const loadMoreResults = () => {
+        const resultsList = document.querySelector(%(results_list_selector)s);
+        if (loading || !resultsList) {
+            return;
+        }
+        if (nextFragment >= fragments.length) {
+            resultsList.insertAdjacentHTML("afterend", '<div class="see-more-jobs__viewed-all">You have viewed all jobs</div>');
+            nextFragment += 1;
+            return;
+        }
+        loading = true;
+        fetch(fragments[nextFragment++]).then(response => response.text()).then(html => {
+            resultsList.insertAdjacentHTML("beforeend", html);
+        }).finally(() => { loading = false; });
+    };
+    window.addEventListener("scroll", () => {
+        if (document.body.scrollHeight - 1 <= window.pageYOffset + window.innerHeight) {
+            loadMoreResults();
+        }
+    });
+    document.addEventListener("click", event => {
+        if (event.target.closest(%(see_more_jobs_selector)s)) {
+            loadMoreResults();
+            return;
+        }
+        const link = event.target.closest("a");
+        const detailsPane = document.querySelector(%(details_pane_selector)s);
+        const jobId = link && link.pathname.match(/(\\d+)\\/?$/);
+        if (!jobId || !detailsPane) {
+            return;
+        }
+        event.preventDefault();
+        fetch("/jobs-guest/jobs/api/jobPosting/" + jobId[1]).then(response => response.text()).then(html => {
+            detailsPane.innerHTML = html;
+        });
+    });
+})();
+</script>
+"""
+
+
+class ReplayRequestHandler(FixtureRequestHandler):
+
+    def find_fixture(self) -> str:
+        recording_path = get_recording_path(self.server.fixture_directory, get_recording_key(self.path))
+        if os.path.isfile(recording_path):
+            return recording_path
+        return super().find_fixture()
+
+    def transform_body(self, fixture_path: str, body: bytes) -> bytes:
+        body = LINKEDIN_URL_PATTERN.sub(self.server.base_url.encode("utf-8"), body)
+        document = self.server.manifest['documents'].get(get_recording_key(self.path))
+        if not document:
+            return body
+        shim = REPLAY_SHIM_SCRIPT % {
+            "fragments": json.dumps(document['fragments']),
+            "results_list_selector": json.dumps(RESULTS_LIST_SELECTOR),
+            "see_more_jobs_selector": json.dumps(SEE_MORE_JOBS_SELECTOR),
+            "details_pane_selector": json.dumps(DETAILS_PANE_SELECTOR),
+        }
+        if b"</body>" in body:
+            return body.replace(b"</body>", shim.encode("utf-8") + b"</body>", 1)
+        return body + shim.encode("utf-8")
+
+
+class ReplayServer(FixtureServer):
+    """Serves a PageRecorder recording directory on localhost."""
+
+    request_handler_class = ReplayRequestHandler
+
+    def __init__(self, recording_directory: str, port: int = 0, response_delay: float = 0):
+        super().__init__(recording_directory, port, response_delay=response_delay)
+        with open(os.path.join(recording_directory, MANIFEST_FILENAME), "r") as f:
+            self.httpd.manifest = json.load(f)
+        self.httpd.base_url = self.base_url
+
+
+def get_replay_config_overrides(base_url: str, scratch_directory: str) -> dict:
+    return {
+        "replay_base_url": base_url,
+        "record_pages": False,
+        # Every bit of state goes to the scratch directory so a replay never touches the real history
+        "jobs_filepath": os.path.join(scratch_directory, "all_jobs.json"),
+        "jobs_database_filepath": os.path.join(scratch_directory, "all_jobs.db"),
+        "journal_directory": os.path.join(scratch_directory, "journals"),
+        "checkpoint_filepath": os.path.join(scratch_directory, "checkpoint.json"),
+        "rate_controller_state_filepath": os.path.join(scratch_directory, "rate_controller.json"),
+        "page_load_profiles_filepath": os.path.join(scratch_directory, "page_load_profiles.json"),
+        "search_planner_filepath": os.path.join(scratch_directory, "search_planner.json"),
+        "new_job_scrapes_directory": scratch_directory,
+        # Nothing to be polite to so there is no pacing, and the recorded run decides what gets walked
+        "rate_initial_delay": 0.01,
+        "rate_minimum_delay": 0.01,
+        "skip_overlapping_timespans": False,
+        "order_searches_by_yield": False,
+        "http_detail_fetch": False,
+        "async_detail_fetch": False,
+        "block_resources": False,
+    }
+
+
+def main():
+    # Imported here as the job scraper module is the one that uses the replay server
+    from job_scraper import CONFIG_OVERRIDES_ENVIRONMENT_VARIABLE, TheJobScraper
+
+    recording_directory = os.path.abspath(sys.argv[1])
+    scratch_directory = tempfile.mkdtemp()
+    os.makedirs(os.path.join(scratch_directory, "journals"), exist_ok=True)
+    with ReplayServer(recording_directory) as server:
+        os.environ[CONFIG_OVERRIDES_ENVIRONMENT_VARIABLE] = json.dumps(get_replay_config_overrides(server.base_url, scratch_directory))
+        # The scraper reads its config files from the working directory
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        scraper = TheJobScraper()
+        start_time = time.perf_counter()
+        try:
+            scraper.scrape_jobs_from_linkedin()
+        finally:
+            if scraper.driver:
+                scraper.driver.quit()
+            scraper.job_store.close()
+        duration = time.perf_counter() - start_time
+        requests_served = server.requests_served
+    print(f"Replayed '{recording_directory}' from {urlparse(server.base_url).netloc}")
+    print(f"Runtime:          {duration:.3f}s")
+    print(f"Scraper requests: {scraper.request_counter}")
+    print(f"Requests served:  {requests_served}")
+    print(f"Jobs scraped:     {len(scraper.new_job_scrapes)} ({len(scraper.good_jobs)} good)")
+    print(f"State files:      {scratch_directory}")
+
+
+if __name__ == '__main__':
+    main()
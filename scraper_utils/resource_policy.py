@@ -0,0 +1,230 @@
+"""Blocks the resources we never look at before Chrome fetches them.
+
+uBlock only takes care of the ads, so every results and job page still pulls in company logos,
+profile pictures, fonts and tracking beacons that the scraper never reads. The policy hands Chrome a
+list of URL patterns through the DevTools Protocol (Network.setBlockedURLs) and any request that
+matches one is failed before it goes out on the wire. Resource types are blocked through the file
+extensions they are served with, on top of the URL patterns from the config for the ones that are
+served without an extension.
+
+Every page load records how many bytes were actually transferred. Chrome does not report the requests
+it blocked to the page, so the policy also counts the resources the page references that match a
+blocked pattern and estimates the bytes they would have cost from typical sizes per resource type.
+Both end up in the run summary. Run it directly to measure the bytes and time actually saved against
+the local fixture server:
+
+    python -m scraper_utils.resource_policy [image count] [chromedriver executable path]
+"""
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from scraper_utils.fixture_server import FixtureServer
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "mp3", "ogg", "m3u8"],
+}
+# Typical sizes of what LinkedIn serves, only used to estimate the bytes that blocking saved
+ESTIMATED_BYTES_PER_RESOURCE_TYPE = {
+    "image": 25_000,
+    "font": 40_000,
+    "media": 500_000,
+}
+# Tracking beacons and the like that are blocked through the URL patterns from the config
+ESTIMATED_BYTES_PER_OTHER_RESOURCE = 5_000
+# LinkedIn serves logos and profile pictures without an extension so the element tells us what they are
+RESOURCE_TYPE_BY_TAG = {
+    "IMG": "image",
+    "VIDEO": "media",
+    "AUDIO": "media",
+    "SOURCE": "media",
+    "TRACK": "media",
+}
+
+
+def get_extension_url_patterns(extension: str) -> list[str]:
+    # The extension has to end the path so that e.g. '/jobs/gifted-engineer' is not taken for a gif
+    return [f"*.{extension}", f"*.{extension}?*"]
+
+
+RESOURCE_TYPE_URL_PATTERNS = {
+    resource_type: [pattern for extension in extensions for pattern in get_extension_url_patterns(extension)]
+    for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()
+}
+
+
+def compile_url_patterns(url_patterns: list[str]) -> re.Pattern:
+    """Compiles Network.setBlockedURLs style patterns, where '*' matches anything, into one regex."""
+    if not url_patterns:
+        return None
+    return re.compile("|".join(".*".join(re.escape(part) for part in pattern.split("*")) for pattern in url_patterns))
+
+
+# Everything the document asked for that could have been blocked before it was fetched
+REFERENCED_URLS_SCRIPT = """
+const urls = new Map();
+document.querySelectorAll("img, source, video, audio, track, link[href], script[src], iframe[src]").forEach(element => {
+    const url = element.currentSrc || element.src || element.href;
+    if (url && !urls.has(url)) {
+        urls.set(url, element.tagName);
+    }
+});
+return Array.from(urls);
+"""
+
+# The performance entries are per document so the time origin tells us when we are on a new one
+TRANSFER_STATS_SCRIPT = """
+const entries = performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"));
+return {
+    timeOrigin: performance.timeOrigin,
+    requests: entries.length,
+    bytes: entries.reduce((total, entry) => total + (entry.transferSize || 0), 0)
+};
+"""
+
+
+class ResourcePolicy:
+
+    def __init__(self, blocked_resource_types: list[str], blocked_url_patterns: list[str]):
+        self.blocked_patterns = list(blocked_url_patterns)
+        for resource_type in blocked_resource_types:
+            if resource_type not in RESOURCE_TYPE_URL_PATTERNS:
+                _log.info(f"There is no way to block the unknown resource type '{resource_type}'")
+                continue
+            self.blocked_patterns.extend(RESOURCE_TYPE_URL_PATTERNS[resource_type])
+        self.resource_type_url_patterns = {
+            resource_type: compile_url_patterns(RESOURCE_TYPE_URL_PATTERNS[resource_type])
+            for resource_type in blocked_resource_types if resource_type in RESOURCE_TYPE_URL_PATTERNS
+        }
+        self.blocked_url_pattern = compile_url_patterns(self.blocked_patterns)
+        self.page_loads = 0
+        self.bytes_transferred = 0
+        self.blocked_requests = 0
+        self.estimated_bytes_saved = 0
+        self.current_document = None
+        self.current_document_bytes = 0
+        self.current_document_blocked_urls = set()
+
+    def apply(self, driver: WebDriver) -> bool:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
+        except WebDriverException as e:
+            _log.info(f"Failed to apply the resource policy so nothing will be blocked: {e}")
+            return False
+        _log.info(f"Blocking {len(self.blocked_patterns)} URL patterns before they are fetched")
+        return True
+
+    def record_page_load(self, driver: WebDriver) -> int:
+        try:
+            transfer_stats = driver.execute_script(TRANSFER_STATS_SCRIPT)
+            referenced_urls = driver.execute_script(REFERENCED_URLS_SCRIPT)
+        except WebDriverException as e:
+            _log.info(f"Failed to read the transfer stats of the page: {e}")
+            return 0
+        # Scrolling the results list loads more into the same document so only the growth is new
+        if transfer_stats['timeOrigin'] != self.current_document:
+            self.current_document = transfer_stats['timeOrigin']
+            self.current_document_bytes = 0
+            self.current_document_blocked_urls = set()
+        bytes_transferred = max(0, transfer_stats['bytes'] - self.current_document_bytes)
+        self.current_document_bytes = transfer_stats['bytes']
+        self.page_loads += 1
+        self.bytes_transferred += bytes_transferred
+        for url, tag_name in referenced_urls:
+            if url in self.current_document_blocked_urls or not self.is_blocked(url):
+                continue
+            self.current_document_blocked_urls.add(url)
+            self.blocked_requests += 1
+            self.estimated_bytes_saved += self.estimate_blocked_bytes(url, tag_name)
+        return bytes_transferred
+
+    def is_blocked(self, url: str) -> bool:
+        return bool(self.blocked_url_pattern and self.blocked_url_pattern.fullmatch(url))
+
+    def estimate_blocked_bytes(self, url: str, tag_name: str = None) -> int:
+        for resource_type, url_pattern in self.resource_type_url_patterns.items():
+            if url_pattern.fullmatch(url):
+                return ESTIMATED_BYTES_PER_RESOURCE_TYPE[resource_type]
+        if tag_name in RESOURCE_TYPE_BY_TAG:
+            return ESTIMATED_BYTES_PER_RESOURCE_TYPE[RESOURCE_TYPE_BY_TAG[tag_name]]
+        return ESTIMATED_BYTES_PER_OTHER_RESOURCE
+
+    def get_summary(self) -> str:
+        average_bytes = self.bytes_transferred / max(self.page_loads, 1)
+        return (
+            f"Transferred {self.bytes_transferred / 1024 / 1024:.1f}MB over {self.page_loads} page loads ({average_bytes / 1024:.0f}KB per load), "
+            f"blocked {self.blocked_requests} requests saving an estimated {self.estimated_bytes_saved / 1024 / 1024:.1f}MB"
+        )
+
+
+def build_benchmark_fixtures(fixture_directory: str, image_count: int) -> None:
+    images = "\n".join(f'<img src="/images/logo_{number}.png">' for number in range(image_count))
+    page = f"""<html><head><style>
+@font-face {{ font-family: "Benchmark"; src: url("/fonts/benchmark.woff2"); }}
+body {{ font-family: "Benchmark"; }}
+</style></head><body>
+<ul class="jobs-search__results-list"><li>Benchmark Engineer</li></ul>
+{images}
+<video src="/media/benchmark.mp4" preload="auto"></video>
+</body></html>"""
+    with open(os.path.join(fixture_directory, "results.html"), "w") as f:
+        f.write(page)
+    fixtures = {"fonts/benchmark.woff2": 100_000, "media/benchmark.mp4": 1_000_000}
+    fixtures.update({f"images/logo_{number}.png": 50_000 for number in range(image_count)})
+    for fixture_path, size in fixtures.items():
+        os.makedirs(os.path.join(fixture_directory, os.path.dirname(fixture_path)), exist_ok=True)
+        with open(os.path.join(fixture_directory, fixture_path), "wb") as f:
+            f.write(os.urandom(size))
+
+
+def load_benchmark_page(server: FixtureServer, chrome_driver_executable_path: str, resource_policy: ResourcePolicy = None) -> tuple[int, float]:
+    # Imported here so the policy itself does not need undetected_chromedriver to be importable
+    import undetected_chromedriver as uc
+
+    options = uc.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = uc.Chrome(options=options, driver_executable_path=chrome_driver_executable_path)
+    try:
+        if resource_policy:
+            resource_policy.apply(driver)
+        starting_bytes = server.bytes_served
+        start_time = time.perf_counter()
+        driver.get(server.base_url + "/results")
+        duration = time.perf_counter() - start_time
+        if resource_policy:
+            resource_policy.record_page_load(driver)
+        return server.bytes_served - starting_bytes, duration
+    finally:
+        driver.quit()
+
+
+def main():
+    image_count = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    chrome_driver_executable_path = sys.argv[2] if len(sys.argv) > 2 else None
+    fixture_directory = tempfile.mkdtemp()
+    build_benchmark_fixtures(fixture_directory, image_count)
+    resource_policy = ResourcePolicy(["image", "font", "media"], [])
+    with FixtureServer(fixture_directory) as server:
+        unblocked_bytes, unblocked_duration = load_benchmark_page(server, chrome_driver_executable_path)
+        blocked_bytes, blocked_duration = load_benchmark_page(server, chrome_driver_executable_path, resource_policy)
+    print(f"Loaded a results page with {image_count} images, a font and a video")
+    print(f"Without the policy: {unblocked_bytes / 1024:.0f}KB in {unblocked_duration:.3f}s")
+    print(f"With the policy:    {blocked_bytes / 1024:.0f}KB in {blocked_duration:.3f}s")
+    print(f"Saved {(unblocked_bytes - blocked_bytes) / 1024:.0f}KB and {unblocked_duration - blocked_duration:.3f}s per page load")
+    print(f"Run summary:        {resource_policy.get_summary()}")
+
+
+if __name__ == '__main__':
+    main()
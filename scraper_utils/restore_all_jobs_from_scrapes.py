@@ -1,21 +1,34 @@
+"""Adds every job from the dated job scrapes that the job store is missing back into it.
+
+Jobs the store already has keep their current rating, keywords and content. Run it from the
+repository directory:
+
+    python -m scraper_utils.restore_all_jobs_from_scrapes
+"""
 import os
+import re
 import json
 
+import yaml
+
+from scraper_utils.job_store import JobStore
+
+# Only the dated job scrapes, the job store and the other state files live next to them
+SCRAPE_FILENAME_PATTERN = re.compile(r"^\d{2}_\d{2}_\d{4}_\d{2}_\d{2}\.json$")
+
+with open('config.yaml', 'r') as f:
+    app_config = yaml.safe_load(f)
 scrapes = []
-all_jobs = []
-job_scrape_dir = 'scrapes'
+job_scrape_dir = app_config['new_job_scrapes_directory']
 for scrape in os.listdir(job_scrape_dir):
-    filepath = os.path.join(job_scrape_dir, scrape)
-    if filepath == "scrapes/.keep":
-            continue
-    scrapes.append(filepath)
+    if not SCRAPE_FILENAME_PATTERN.match(scrape):
+        continue
+    scrapes.append(os.path.join(job_scrape_dir, scrape))
 scrapes.sort()
-for filepath in scrapes:
-    new_scrape_data = []
-    duplicates_in_scrape = 0
-    with open(filepath, 'r') as f:
-        job_data = json.load(f)
-        for job in job_data:
-            all_jobs.append(job)
-with open("all_jobs.json", 'w') as f:
-    json.dump(all_jobs, f)
+with JobStore(app_config['jobs_database_filepath']) as job_store:
+    for filepath in scrapes:
+        with open(filepath, 'r') as f:
+            job_data = json.load(f)
+        # Jobs are keyed by their job id so a job found in several scrapes is only stored once
+        restored_jobs = job_store.insert_missing_jobs(job_data)
+        print(f"Restored {restored_jobs} jobs from {filepath}")
@@ -0,0 +1,132 @@
+"""Bulk extraction of the job result cards with a single execute_script round trip.
+
+Reading the text, link and posted date of every card through WebDriver costs several round trips
+per card. This runs one snippet over the results list instead and hands back plain dicts for
+every card from the given index onward, in the same order as the list items.
+
+extract_result_cards_from_html does the same for saved results pages, which the offline tooling uses.
+
+It also holds the lightweight wait used while scrolling the infinite results list, which only waits
+for more cards or the end of the results to show up instead of a full page load.
+"""
+import logging
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+EXTRACT_RESULT_CARDS_SCRIPT = """
+const resultsListXpath = arguments[0];
+const startingIndex = arguments[1];
+const resultsList = document.evaluate(resultsListXpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!resultsList) {
+    return [];
+}
+const textOf = (card, selector) => {
+    const element = card.querySelector(selector);
+    return element ? element.innerText.trim() : "";
+};
+return Array.from(resultsList.getElementsByTagName("li")).slice(startingIndex).map(card => {
+    const link = card.querySelector("a");
+    const time = card.querySelector("time");
+    return {
+        url: link ? link.href : "",
+        title: textOf(card, ".base-search-card__title"),
+        company: textOf(card, ".base-search-card__subtitle"),
+        location: textOf(card, ".job-search-card__location"),
+        datetime: time ? time.getAttribute("datetime") || "" : "",
+        text: card.innerText || ""
+    };
+});
+"""
+
+
+def extract_result_cards(driver: WebDriver, results_list_xpath: str, starting_index: int) -> list[dict]:
+    try:
+        result_cards = driver.execute_script(EXTRACT_RESULT_CARDS_SCRIPT, results_list_xpath, starting_index)
+    except (JavascriptException, WebDriverException) as e:
+        # The caller falls back to reading each card through WebDriver
+        _log.info(f"Failed to bulk extract the result cards: {e}")
+        return []
+    return result_cards or []
+
+
+SCROLL_AND_WAIT_SCRIPT = """
+const resultsListXpath = arguments[0];
+const endOfResultsClass = arguments[1];
+const timeout = arguments[2];
+const done = arguments[arguments.length - 1];
+const resultsList = document.evaluate(resultsListXpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const countResults = () => resultsList ? resultsList.getElementsByTagName("li").length : 0;
+const reachedEndOfResults = () => {
+    const endOfResults = document.getElementsByClassName(endOfResultsClass)[0];
+    return Boolean(endOfResults && endOfResults.offsetParent !== null);
+};
+const startingCount = countResults();
+let finished = false;
+const finish = () => {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timeoutTimer);
+    done({
+        grew: countResults() > startingCount,
+        count: countResults(),
+        endOfResults: reachedEndOfResults(),
+        atBottom: document.body.scrollHeight - 1 <= window.pageYOffset + window.innerHeight
+    });
+};
+const check = () => {
+    if (countResults() > startingCount || reachedEndOfResults()) {
+        finish();
+    }
+};
+const observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ["class", "style"]});
+const timeoutTimer = setTimeout(finish, timeout);
+window.scrollTo(0, document.body.scrollHeight);
+check();
+"""
+
+
+def scroll_and_wait_for_more_results(driver: WebDriver, results_list_xpath: str, end_of_results_class: str, timeout: float) -> dict:
+    """Scrolls to the bottom and waits only until more cards show up, the end of results shows up, or the timeout.
+
+    Returns None when the script could not be run so that the caller can fall back to a full page load wait."""
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return driver.execute_async_script(SCROLL_AND_WAIT_SCRIPT, results_list_xpath, end_of_results_class, int(timeout * 1000))
+    except (JavascriptException, WebDriverException) as e:
+        _log.info(f"Failed to scroll and wait for more results: {e}")
+        return None
+
+
+def extract_result_cards_from_html(html: str) -> list[dict]:
+    """Offline counterpart of extract_result_cards for saved results pages and result fragments."""
+    # Imported here as only the offline tooling needs it
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    list_items = soup.select("section[class*='results-list'] > ul li") or soup.find_all("li")
+    result_cards = []
+    for card in list_items:
+        link = card.find("a")
+        time = card.find("time")
+        result_cards.append({
+            "url": link.get("href", "") if link else "",
+            "title": _get_text_of(card, ".base-search-card__title"),
+            "company": _get_text_of(card, ".base-search-card__subtitle"),
+            "location": _get_text_of(card, ".job-search-card__location"),
+            "datetime": time.get("datetime", "") if time else "",
+            "text": card.get_text("\n", strip=True),
+        })
+    return result_cards
+
+
+def _get_text_of(card, selector: str) -> str:
+    element = card.select_one(selector)
+    return element.get_text(strip=True) if element else ""
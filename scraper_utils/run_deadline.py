@@ -0,0 +1,62 @@
+"""Run level time budget that every wait and retry of a scrape answers to.
+
+The app kills the scraper once it has run for too long, which throws away whatever unit was in
+flight and can happen in the middle of a multi hour retry back off. Instead the run gets a deadline
+that is a little shorter than that, and every (search, location) unit gets its own allotment of it.
+Retries stop and back off waits shrink as a deadline gets close, and a unit that runs out of time is
+abandoned cleanly, leaving its checkpoint offset behind so the next run picks it up from there.
+"""
+import logging
+import time
+
+from tenacity.stop import stop_base
+
+from scraper_utils.exceptions import DeadlineExceededException
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+
+class RunDeadline:
+
+    def __init__(self, ends_at: float, unit_allotment: float):
+        self.ends_at = ends_at
+        self.unit_allotment = unit_allotment
+        self.unit_ends_at = None
+
+    def get_remaining(self) -> float:
+        return self.ends_at - time.time()
+
+    def is_run_expired(self) -> bool:
+        return self.get_remaining() <= 0
+
+    def start_unit(self) -> None:
+        self.unit_ends_at = min(self.ends_at, time.time() + self.unit_allotment)
+
+    def end_unit(self) -> None:
+        self.unit_ends_at = None
+
+    def get_unit_remaining(self) -> float:
+        # Outside of a unit the run deadline is the only one that applies
+        return (self.unit_ends_at or self.ends_at) - time.time()
+
+    def is_expired(self) -> bool:
+        return self.get_unit_remaining() <= 0
+
+    def check(self) -> None:
+        if self.is_expired():
+            raise DeadlineExceededException("We have run out of time for this unit")
+
+    def cap_wait(self, wait: float) -> float:
+        return max(0.0, min(wait, self.get_unit_remaining()))
+
+
+class stop_at_deadline(stop_base):
+    """Tenacity stop strategy that gives up once the deadline of the decorated object has passed."""
+
+    def __call__(self, retry_state) -> bool:
+        run_deadline = retry_state.args[0].run_deadline
+        if run_deadline.is_expired():
+            _log.info("Giving up on the retries as we have run out of time")
+            return True
+        return False
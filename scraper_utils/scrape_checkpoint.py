@@ -0,0 +1,82 @@
+"""Checkpoint of the (search, location, timespan) units that a run has already finished.
+
+The checkpoint also remembers how far into the result list of the units in progress we got, so
+that a run which crashed or was killed can pick up where it left off instead of repeating the
+entire multi-hour walk. Checkpoints older than the configured maximum age are ignored so that
+the next scheduled run always starts from scratch.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+
+class ScrapeCheckpoint:
+
+    def __init__(self, checkpoint_path: str, max_age_hours: float):
+        self.checkpoint_path = checkpoint_path
+        self.max_age = timedelta(hours=max_age_hours)
+        self.created = datetime.now()
+        self.completed_units = set()
+        # Several browser workers can have a unit in progress at the same time
+        self.unit_offsets = {}
+        self.load()
+
+    @staticmethod
+    def get_unit_key(search: str, location: str, timespan: str) -> tuple:
+        return (search, location, timespan)
+
+    def load(self) -> None:
+        if not os.path.exists(self.checkpoint_path):
+            return
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+            created = datetime.fromisoformat(checkpoint['created'])
+        except (OSError, ValueError, KeyError) as e:
+            _log.info(f"Ignoring the unreadable checkpoint '{self.checkpoint_path}': {e}")
+            return
+        if datetime.now() - created > self.max_age:
+            _log.info(f"Ignoring the checkpoint from {created} as it is older than {self.max_age}")
+            return
+        self.created = created
+        self.completed_units = {tuple(unit) for unit in checkpoint.get('completed_units', [])}
+        self.unit_offsets = {tuple(unit[:3]): unit[3] for unit in checkpoint.get('unit_offsets', [])}
+        _log.info(f"Resuming from a checkpoint with {len(self.completed_units)} completed units")
+
+    def save(self) -> None:
+        checkpoint = {
+            "created": self.created.isoformat(),
+            "completed_units": [list(unit) for unit in sorted(self.completed_units)],
+            "unit_offsets": [list(unit) + [offset] for unit, offset in sorted(self.unit_offsets.items())],
+        }
+        # Write to a temporary file first so that a crash can never leave us with half a checkpoint
+        temporary_path = self.checkpoint_path + ".tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def is_unit_completed(self, search: str, location: str, timespan: str) -> bool:
+        return self.get_unit_key(search, location, timespan) in self.completed_units
+
+    def get_offset(self, search: str, location: str, timespan: str) -> int:
+        return self.unit_offsets.get(self.get_unit_key(search, location, timespan), 0)
+
+    def update_offset(self, search: str, location: str, timespan: str, offset: int) -> None:
+        self.unit_offsets[self.get_unit_key(search, location, timespan)] = offset
+        self.save()
+
+    def complete_unit(self, search: str, location: str, timespan: str) -> None:
+        unit_key = self.get_unit_key(search, location, timespan)
+        self.completed_units.add(unit_key)
+        self.unit_offsets.pop(unit_key, None)
+        self.save()
+
+    def clear(self) -> None:
+        self.completed_units = set()
+        self.unit_offsets = {}
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
@@ -0,0 +1,68 @@
+"""Append-only NDJSON journal for the job postings found during a run.
+
+Every posting is written and flushed as soon as it is produced so that a run which gets killed
+(for example by the timeout in app.py) does not lose hours of browser work. The next run
+recovers any journals that were left behind and the journal is discarded once its postings
+have been folded into the job store.
+"""
+import json
+import logging
+import os
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+JOURNAL_EXTENSION = ".ndjson"
+
+
+class ScrapeJournal:
+
+    def __init__(self, journal_directory: str, run_name: str):
+        self.journal_directory = journal_directory
+        os.makedirs(self.journal_directory, exist_ok=True)
+        self.journal_path = os.path.join(self.journal_directory, run_name + JOURNAL_EXTENSION)
+        self.recovered_journal_paths = []
+        self.journal_file = open(self.journal_path, "a")
+
+    def recover(self) -> list[dict]:
+        # Reads back the postings from journals that a previous run never got to fold into the job store
+        recovered_job_postings = []
+        for filename in sorted(os.listdir(self.journal_directory)):
+            journal_path = os.path.join(self.journal_directory, filename)
+            if not filename.endswith(JOURNAL_EXTENSION) or journal_path == self.journal_path:
+                continue
+            recovered_job_postings.extend(self.read_journal(journal_path))
+            self.recovered_journal_paths.append(journal_path)
+        return recovered_job_postings
+
+    @staticmethod
+    def read_journal(journal_path: str) -> list[dict]:
+        job_postings = []
+        with open(journal_path, "r") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    job_postings.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # The process was most likely killed in the middle of writing this line
+                    _log.info(f"Skipping the unreadable line {line_number} in the journal '{journal_path}'")
+        _log.info(f"Recovered {len(job_postings)} job postings from the journal '{journal_path}'")
+        return job_postings
+
+    def append(self, job_posting_json: dict) -> None:
+        self.journal_file.write(json.dumps(job_posting_json) + "\n")
+        self.journal_file.flush()
+
+    def close(self) -> None:
+        if not self.journal_file.closed:
+            self.journal_file.close()
+
+    def discard(self) -> None:
+        # Only called once everything in the journals has safely made it into the job store
+        self.close()
+        for journal_path in self.recovered_journal_paths + [self.journal_path]:
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+        self.recovered_journal_paths = []
@@ -0,0 +1,70 @@
+"""Encodes our search filters as LinkedIn job search query parameters.
+
+Applying the timespan, job type, remote and experience level filters through the URL means one
+navigation per unit instead of opening and clicking through four or five filter dropdowns, each
+followed by a full page load.
+"""
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+
+BASE_SEARCH_URL = "https://www.linkedin.com/jobs/search?"
+
+TIMESPAN_PARAMETERS = {
+    "day": "r86400",
+    "week": "r604800",
+    "month": "r2592000",
+}
+
+FULL_TIME_PARAMETER = "F"
+
+# Most recent postings first, which lets us stop walking the results once we only see known jobs
+SORT_BY_DATE_PARAMETER = "DD"
+
+REMOTE_PARAMETER = "2"
+HYBRID_PARAMETER = "3"
+
+EXPERIENCE_LEVEL_PARAMETERS = {
+    "internship": "1",
+    "entry level": "2",
+    "associate": "3",
+    "mid-senior level": "4",
+    "director": "5",
+    "executive": "6",
+}
+
+
+def encode_search_filters(timespan: str, include_hybrid_jobs: bool, experience_levels: dict) -> dict:
+    search_filters = {
+        "f_TPR": TIMESPAN_PARAMETERS[timespan],
+        "f_JT": FULL_TIME_PARAMETER,
+    }
+    work_types = [REMOTE_PARAMETER]
+    if include_hybrid_jobs:
+        work_types.append(HYBRID_PARAMETER)
+    search_filters["f_WT"] = ",".join(work_types)
+    target_experience_levels = [
+        EXPERIENCE_LEVEL_PARAMETERS[level.lower().strip()]
+        for level, wanted in experience_levels.items()
+        if wanted and level.lower().strip() in EXPERIENCE_LEVEL_PARAMETERS
+    ]
+    if target_experience_levels:
+        search_filters["f_E"] = ",".join(sorted(target_experience_levels))
+    return search_filters
+
+
+def build_search_url(search: str, location: str, search_filters: dict = None, sort_by_date: bool = False, base_search_url: str = BASE_SEARCH_URL) -> str:
+    query_parameters = {"keywords": search, "location": location}
+    if search_filters:
+        query_parameters.update(search_filters)
+    if sort_by_date:
+        query_parameters["sortBy"] = SORT_BY_DATE_PARAMETER
+    return base_search_url + urlencode(query_parameters, quote_via=quote)
+
+
+def results_are_sorted_by_date(url: str) -> bool:
+    return parse_qs(urlparse(url).query).get("sortBy", [None])[0] == SORT_BY_DATE_PARAMETER
+
+
+def search_filters_were_applied(url: str, search_filters: dict) -> bool:
+    # LinkedIn drops parameters it does not understand so we check they survived the page load
+    query_parameters = parse_qs(urlparse(url).query)
+    return all(query_parameters.get(name, [None])[0] == value for name, value in search_filters.items())
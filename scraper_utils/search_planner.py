@@ -0,0 +1,124 @@
+"""Plans which (search, location) pairs a run walks, in what order, and with which LinkedIn timespans.
+
+The day, week and month windows are nested, so walking all three mostly re-walks postings that were
+just seen. The planner remembers when every pair was last scraped in full and only plans the
+narrowest window that still covers the time since then, falling back to the month window for pairs
+we have never scraped or have not scraped in over a month.
+
+It also keeps the yield of the last few runs of every pair (new good postings, duplicates and what
+it cost in requests and seconds). Pairs are walked in order of their expected new good postings per
+request so the best pairs are done before the run budget runs out, and pairs that found nothing new
+for several runs in a row are deferred, with a re-probe every so often in case they pick up again.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+TIMESPAN_WINDOWS = {
+    "day": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+}
+
+# Only this many of the most recent runs are kept for every pair
+MAXIMUM_RUN_HISTORY = 10
+
+
+class SearchPlanner:
+
+    def __init__(self, state_path: str, idle_runs_before_deferring: int = 3, reprobe_every_runs: int = 5):
+        self.state_path = state_path
+        self.idle_runs_before_deferring = idle_runs_before_deferring
+        self.reprobe_every_runs = reprobe_every_runs
+        self.search_history = {}
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            for unit in state['units']:
+                self.search_history[(unit['search'], unit['location'])] = unit
+        except (OSError, ValueError, KeyError) as e:
+            _log.info(f"Ignoring the unreadable search planner state '{self.state_path}': {e}")
+            self.search_history = {}
+
+    def save(self) -> None:
+        state = {
+            "units": list(self.search_history.values()),
+        }
+        temporary_path = self.state_path + ".tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary_path, self.state_path)
+
+    def get_unit_history(self, search: str, location: str) -> dict:
+        if (search, location) not in self.search_history:
+            self.search_history[(search, location)] = {"search": search, "location": location, "last_scraped": None}
+        unit_history = self.search_history[(search, location)]
+        unit_history.setdefault("runs", [])
+        unit_history.setdefault("deferred_runs", 0)
+        return unit_history
+
+    def get_expected_yield(self, search: str, location: str) -> float:
+        # New good postings per request over the recent runs, pairs we know nothing about go first
+        runs = self.get_unit_history(search, location)['runs']
+        if not runs:
+            return float("inf")
+        new_good_jobs = sum(run['new_good_jobs'] for run in runs)
+        requests = sum(run['requests'] for run in runs)
+        return new_good_jobs / max(requests, 1)
+
+    def get_duplicate_ratio(self, search: str, location: str) -> float:
+        runs = self.get_unit_history(search, location)['runs']
+        postings_seen = sum(run['postings_seen'] for run in runs)
+        if not postings_seen:
+            return 0.0
+        return sum(run['duplicates'] for run in runs) / postings_seen
+
+    def is_idle(self, search: str, location: str) -> bool:
+        recent_runs = self.get_unit_history(search, location)['runs'][-self.idle_runs_before_deferring:]
+        if len(recent_runs) < self.idle_runs_before_deferring:
+            return False
+        return all(run['postings_seen'] > 0 and run['postings_seen'] - run['duplicates'] == 0 for run in recent_runs)
+
+    def plan_units(self, units: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        planned_units = []
+        for search, location in units:
+            unit_history = self.get_unit_history(search, location)
+            if self.is_idle(search, location):
+                unit_history['deferred_runs'] += 1
+                # Every so often an idle pair is walked again in case it has picked up
+                if unit_history['deferred_runs'] % self.reprobe_every_runs != 0:
+                    _log.info(f"Deferring '{search}' in '{location}' as it found nothing new in its recent runs")
+                    continue
+            planned_units.append((search, location))
+        planned_units.sort(key=lambda unit: (-self.get_expected_yield(*unit), self.get_duplicate_ratio(*unit)))
+        self.save()
+        return planned_units
+
+    def plan_timespans(self, search: str, location: str) -> list[str]:
+        last_scraped = self.get_unit_history(search, location)['last_scraped']
+        if not last_scraped:
+            return ["month"]
+        time_since_last_scrape = datetime.now() - datetime.fromisoformat(last_scraped)
+        for timespan, window in TIMESPAN_WINDOWS.items():
+            if time_since_last_scrape <= window:
+                return [timespan]
+        return ["month"]
+
+    def record_scraped(self, search: str, location: str, scraped_at: str) -> None:
+        self.get_unit_history(search, location)['last_scraped'] = scraped_at
+        self.save()
+
+    def record_run(self, search: str, location: str, run_stats: dict) -> None:
+        unit_history = self.get_unit_history(search, location)
+        unit_history['runs'].append(run_stats)
+        del unit_history['runs'][:-MAXIMUM_RUN_HISTORY]
+        self.save()
@@ -0,0 +1,38 @@
+import types
+
+from job_scraper import TheJobScraper
+from scraper_utils.job_store import JobStore
+from scraper_utils.keyword_rater import KeywordRater
+
+WORD_WEIGHTS = {"terraform": 15, "kubernetes": 10, "travel": -100}
+
+
+def build_scraper(job_store: JobStore, new_job_scrapes: list[dict] = ()) -> types.SimpleNamespace:
+    scraper = types.SimpleNamespace(
+        job_store=job_store,
+        all_jobs=job_store.get_all_jobs(),
+        new_job_scrapes=list(new_job_scrapes),
+        keyword_rater=KeywordRater(WORD_WEIGHTS),
+        app_config={"rating_processes": 1, "delta_rerate_max_changed_keywords": 5},
+        log=lambda message: None,
+    )
+    scraper.get_delta_rater = lambda previous_fingerprint: TheJobScraper.get_delta_rater(scraper, previous_fingerprint)
+    return scraper
+
+
+def get_rating(job_store: JobStore, url: str) -> tuple[int, str]:
+    job = next(job for job in job_store.get_all_jobs() if job['url'] == url)
+    return job['rating'], job['keywords']
+
+
+def test_reupserted_job_is_rerated(tmp_path):
+    url = "https://www.linkedin.com/jobs/view/job-1"
+    with JobStore(str(tmp_path / "all_jobs.db")) as job_store:
+        job_store.upsert_jobs([{"url": url, "content": "Terraform and Kubernetes", "rating": 0, "keywords": ""}])
+        TheJobScraper.update_main_job_posting_data_ratings(build_scraper(job_store))
+        assert get_rating(job_store, url) == (25, "terraform,kubernetes")
+
+        # A stale rating written over a job that was already rated with the current weights
+        job_store.upsert_jobs([{"url": url, "content": "Terraform and Kubernetes", "rating": 99, "keywords": "old"}])
+        TheJobScraper.update_main_job_posting_data_ratings(build_scraper(job_store))
+        assert get_rating(job_store, url) == (25, "terraform,kubernetes")